@@ -0,0 +1,89 @@
+"""
+Benchmark: cold-start import time of the API module
+Imports `main` in fresh interpreters, reports wall time and the slowest
+modules from `python -X importtime`, and checks that the LLM / LangGraph
+stack stays out of the startup path.
+
+Run from backend/:  python -m benchmarks.bench_import_time [--runs 5] [--max-ms 800]
+Exits non-zero if the median exceeds --max-ms or a lazy module was imported,
+so it can be used as a CI gate.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only load on first use / warm-up
+LAZY_MODULES = ["graph", "langgraph", "langchain_core", "langchain_google_genai"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "elapsed_ms": elapsed * 1000,
+    "eager": [m for m in {lazy!r} if m in sys.modules]
+}}))
+"""
+
+
+def run_probe() -> dict:
+    env = dict(os.environ, WARMUP_ON_STARTUP="false")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(lazy=LAZY_MODULES)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int = 10) -> list:
+    """Parse `-X importtime` output into (cumulative_us, module) pairs"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=dict(os.environ, WARMUP_ON_STARTUP="false"),
+        capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the median exceeds this")
+    args = parser.parse_args()
+
+    results = [run_probe() for _ in range(args.runs)]
+    timings = [r["elapsed_ms"] for r in results]
+    eager = sorted({m for r in results for m in r["eager"]})
+    median = statistics.median(timings)
+
+    print(f"import main: median {median:.1f} ms, min {min(timings):.1f} ms, max {max(timings):.1f} ms ({args.runs} runs)")
+    print("slowest imports (cumulative):")
+    for cumulative, name in slowest_imports():
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    failed = False
+    if eager:
+        print(f"FAIL: lazy modules imported at startup: {', '.join(eager)}")
+        failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median import time {median:.1f} ms exceeds budget {args.max_ms:.1f} ms")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Benchmark: /api/analyze response serialization
+Encode/decode cost and payload size of a typical analyze response with the
+stdlib encoder (Starlette's JSONResponse), orjson and MessagePack, then the
+per-request cost through the FastAPI route itself (TestClient, workflow
+replaced by a finished state) per negotiated encoding, against the same body
+returned as a dict so FastAPI runs jsonable_encoder before rendering. Codecs
+that are not installed are skipped.
+
+Run from backend/:  python -m benchmarks.bench_serialization [--requests 500]
+"""
+
+import argparse
+
+import asyncio
+import json
+import os
+import time
+
+from nodes.triage import keyword_triage
+from nodes.evidence import evidence_collector
+from nodes.router import nodal_router
+from nodes.reporter import report_fields, build_fallback_report
+from nodes.results import to_payload
+
+ITERATIONS = 5000
+
+SAMPLE_INPUT = {
+    "complaint": (
+        "I received a call from +91 98765 43210 claiming to be from a trading desk. They added me to a "
+        "WhatsApp group promising 300% returns on fake-trading-app.com and I paid Rs. 2.5 lakh to "
+        "scammer@ybl over three transfers. The app now shows a balance but blocks withdrawals. "
+    ) * 4,
+    "utr": "HDFC1234567890",
+    "bank_name": None,
+    "amount": 250000.0,
+    "suspect_phone": "+91 98765 43210",
+    "suspect_url": "https://fake-trading-app.com/login",
+    "incident_date": "2026-01-15",
+    "victim_name": "Test Victim",
+    "victim_phone": "9000000000"
+}
+
+
+async def analyze_state() -> dict:
+    """A finished workflow state built from the deterministic node paths"""
+    state = dict(SAMPLE_INPUT)
+    state.update(keyword_triage(state["complaint"]))
+    state.update(await evidence_collector(state))
+    state.update(await nodal_router(state))
+    state["report"] = build_fallback_report(report_fields(state), "benchmark")
+    state.update({
+        "workflow_complete": True,
+        "workflow_mode": "standard",
+        "pipeline_mode": "full",
+        "case_id": "0" * 32,
+        "llm_usage": [
+            {"node": "triage", "input_tokens": 412, "output_tokens": 96, "latency_ms": 812.4,
+             "hedged": False, "winner": "primary"},
+            {"node": "reporter", "input_tokens": 655, "output_tokens": 540, "latency_ms": 2210.9,
+             "hedged": False, "winner": "primary"}
+        ],
+        "degradation": {"mode": "full", "transition": None}
+    })
+    return state
+
+
+def analyze_response(state: dict) -> dict:
+    """The /api/analyze response body for a finished state"""
+    return {
+        "success": True,
+        "workflow_complete": True,
+        "mode": state["workflow_mode"],
+        "pipeline_mode": state["pipeline_mode"],
+        "case_id": state["case_id"],
+        "data": {
+            "triage": {
+                "scam_type": state["scam_type"],
+                "confidence": state["scam_confidence"],
+                "urgency": state["urgency"],
+                "reasoning": state["scam_reasoning"],
+                "indicators": state["key_indicators"]
+            },
+            "evidence": to_payload(state["evidence"]),
+            "routing": to_payload(state["routing"]),
+            "report": to_payload(state["report"]),
+            "llm_usage": state["llm_usage"],
+            "speculation": None,
+            "escalation": None,
+            "degradation": state["degradation"]
+        }
+    }
+
+
+def codecs() -> dict:
+    """name -> (encode, decode) for every available codec"""
+    available = {
+        # Same settings as starlette.responses.JSONResponse.render
+        "json (stdlib)": (
+            lambda obj: json.dumps(obj, ensure_ascii=False, allow_nan=False, indent=None,
+                                   separators=(",", ":")).encode("utf-8"),
+            json.loads
+        )
+    }
+    try:
+        import orjson
+        available["orjson"] = (orjson.dumps, orjson.loads)
+    except ImportError:
+        print("orjson not installed, skipping")
+    try:
+        import msgpack
+        available["msgpack"] = (
+            lambda obj: msgpack.packb(obj, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False)
+        )
+    except ImportError:
+        print("msgpack not installed, skipping")
+    return available
+
+
+def per_call_us(fn, arg) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(arg)
+    return (time.perf_counter() - started) / ITERATIONS * 1e6
+
+
+def route_timings(state: dict, requests: int) -> list:
+    """(variant, bytes, us per request) for POST /api/analyze through the FastAPI app"""
+    os.environ["RATE_LIMITS"] = ""
+    os.environ["WARMUP_ON_STARTUP"] = "false"
+    from fastapi.testclient import TestClient
+
+    import main
+    from services import negotiation
+
+    async def finished_workflow(input_data: dict) -> dict:
+        return state
+
+    main.execute_workflow = finished_workflow
+    body = analyze_response(state)
+
+    # What /api/analyze did before returning NegotiatedResponse: a dict FastAPI jsonable_encodes
+    @main.app.post("/benchmark/analyze-dict")
+    async def analyze_dict(request: main.FraudReportRequest):
+        return body
+
+    variants = [("route, json (stdlib)", "/api/analyze", "application/json", False)]
+    if negotiation.orjson is not None:
+        variants.append(("route, orjson", "/api/analyze", "application/json", True))
+    if negotiation.msgpack is not None:
+        variants.append(("route, msgpack", "/api/analyze", "application/msgpack", True))
+    variants.append(("dict + jsonable", "/benchmark/analyze-dict", "application/json", True))
+
+    results = []
+    fast_json = negotiation.orjson
+    with TestClient(main.app) as client:
+        for name, path, accept, use_orjson in variants:
+            negotiation.orjson = fast_json if use_orjson else None
+            headers = {"Accept": accept, "Idempotency-Key": "benchmark"}
+            response = client.post(path, json=SAMPLE_INPUT, headers=headers)  # warm the replay cache
+            assert response.status_code == 200, f"{name}: {response.status_code} {response.text[:200]}"
+            started = time.perf_counter()
+            for _ in range(requests):
+                client.post(path, json=SAMPLE_INPUT, headers=headers)
+            results.append((name, len(response.content), (time.perf_counter() - started) / requests * 1e6))
+    negotiation.orjson = fast_json
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/analyze response serialization cost")
+    parser.add_argument("--requests", type=int, default=500, help="requests per variant through the route")
+    args = parser.parse_args()
+
+    state = asyncio.run(analyze_state())
+    payload = analyze_response(state)
+    available = codecs()
+
+    print(f"{'codec':<16}{'bytes':>8}{'encode us':>12}{'decode us':>12}")
+    baseline = None
+    for name, (encode, decode) in available.items():
+        body = encode(payload)
+        assert decode(body) == payload, f"{name} does not round-trip"
+        encode_us = per_call_us(encode, payload)
+        decode_us = per_call_us(decode, body)
+        baseline = baseline or (len(body), encode_us, decode_us)
+        print(f"{name:<16}{len(body):>8}{encode_us:>12.1f}{decode_us:>12.1f}"
+              f"   ({len(body) / baseline[0]:.0%} size, {encode_us / baseline[1]:.0%} encode, "
+              f"{decode_us / baseline[2]:.0%} decode vs stdlib)")
+
+    print(f"\n{'variant':<24}{'bytes':>8}{'us/request':>12}")
+    timings = route_timings(state, args.requests)
+    for name, size, request_us in timings:
+        print(f"{name:<24}{size:>8}{request_us:>12.1f}   ({request_us / timings[0][2]:.0%} vs stdlib route)")
+
+
+if __name__ == "__main__":
+    main()
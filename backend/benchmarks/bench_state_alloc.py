@@ -0,0 +1,140 @@
+"""
+Benchmark: workflow state allocations per /api/analyze call
+Runs the compiled standard LangGraph workflow (get_fraud_workflow("standard")
+.ainvoke) twice: with the legacy nodes that returned a full copy of the state
+with dict payloads, and with the current delta-returning nodes. The LLM calls
+are replaced by fixed replies so only graph and state handling is measured.
+
+Run from backend/:  python -m benchmarks.bench_state_alloc [--iterations 300]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import graph
+import nodes.reporter
+import nodes.triage
+from nodes.results import to_payload
+
+SAMPLE_INPUT = {
+    "complaint": "I got a WhatsApp message about a trading app promising 300% returns. " * 40,
+    "utr": "HDFC1234567890",
+    "bank_name": None,
+    "amount": 250000.0,
+    "suspect_phone": "+91 98765 43210",
+    "suspect_url": "https://fake-trading-app.com/login",
+    "incident_date": "2026-01-15",
+    "victim_name": "Test Victim",
+    "victim_phone": "9000000000"
+}
+
+LLM_REPLIES = {
+    "triage": {
+        "scam_type": "investment_scam",
+        "urgency": "high",
+        "confidence": 0.92,
+        "key_indicators": ["trading app", "guaranteed returns"],
+        "reasoning": "Guaranteed returns on an unknown trading app"
+    },
+    "reporter": {
+        "title": "Cyber Fraud Report - investment_scam",
+        "body": "Investment fraud through a fake trading app. " * 12,
+        "key_evidence": ["UTR HDFC1234567890"],
+        "recommended_actions": ["Freeze beneficiary account"],
+        "priority_level": "high"
+    }
+}
+
+# Node functions the standard workflow is built from (module attributes of graph.py)
+GRAPH_NODES = ("triage_auditor", "evidence_collector", "nodal_router", "portal_reporter")
+
+
+async def stub_llm(prompt_template, variables, temperature=0.1, node="llm", deadline=None):
+    usage = {"node": node, "input_tokens": 400, "output_tokens": 100, "latency_ms": 0.0,
+             "hedged": False, "winner": "primary"}
+    return dict(LLM_REPLIES[node]), usage
+
+
+def legacy_node(node):
+    """Wrap a delta node the way nodes were written before: full state copy, dict payloads"""
+    async def full_state_node(state: dict) -> dict:
+        delta = await node(state)
+        delta = {key: to_payload(value) if hasattr(value, "to_dict") else value for key, value in delta.items()}
+        # llm_usage has an add reducer; re-sending the old list would duplicate it
+        return {**{key: value for key, value in state.items() if key != "llm_usage"}, **delta}
+    full_state_node.__name__ = node.__name__
+    return full_state_node
+
+
+def compile_standard(legacy: bool):
+    """Compile get_fraud_workflow("standard") with legacy or current nodes"""
+    originals = {name: getattr(graph, name) for name in GRAPH_NODES}
+    graph._compiled_workflows.clear()
+    try:
+        if legacy:
+            for name, node in originals.items():
+                setattr(graph, name, legacy_node(node))
+        return graph.get_fraud_workflow("standard")
+    finally:
+        for name, node in originals.items():
+            setattr(graph, name, node)
+        graph._compiled_workflows.clear()
+
+
+def initial_state() -> dict:
+    """Initial state as built by graph.run_fraud_workflow (no case_id: triage is not streamed)"""
+    return {
+        **SAMPLE_INPUT,
+        "workflow_mode": "standard",
+        "pipeline_mode": "full",
+        "degradation": None,
+        "deadline": None,
+        "llm_usage": [],
+        "triage_complete": False,
+        "evidence_complete": False,
+        "routing_complete": False,
+        "report_complete": False,
+        "workflow_complete": False
+    }
+
+
+async def measure(workflow, iterations: int) -> tuple:
+    """Return (seconds per call, mean peak bytes allocated per call)"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await workflow.ainvoke(initial_state())
+    elapsed = (time.perf_counter() - started) / iterations
+
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(iterations):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await workflow.ainvoke(initial_state())
+        peak_total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return elapsed, peak_total / iterations
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="State allocations per standard workflow run")
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    nodes.triage.invoke_json_with_usage = stub_llm
+    nodes.reporter.invoke_json_with_usage = stub_llm
+
+    print(f"{'nodes':<8} {'us/call':>10} {'peak bytes/call':>16}")
+    for name, legacy in (("legacy", True), ("delta", False)):
+        workflow = compile_standard(legacy)
+        final = await workflow.ainvoke(initial_state())  # warm caches
+        assert final["workflow_complete"] and len(final["llm_usage"]) == 2, f"{name} run incomplete"
+        elapsed, peak = await measure(workflow, args.iterations)
+        print(f"{name:<8} {elapsed * 1e6:>10.1f} {peak:>16.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Benchmark: standard two-call pipeline vs fused triage+report
+Runs sample complaints through each workflow mode against the live Gemini
+API and compares wall-clock latency and token usage.
+
+Run from backend/ with GOOGLE_API_KEY set:
+    python -m benchmarks.bench_workflow_modes [--rounds 3] [--modes standard fused speculative]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+SAMPLE_CASES = [
+    {
+        "complaint": "A man called claiming to be from CBI and said a parcel in my name had drugs. "
+                     "He kept me on video call for 6 hours as a digital arrest and made me transfer money.",
+        "amount": 450000, "utr": "SBIN0123456789", "bank_name": "State Bank of India"
+    },
+    {
+        "complaint": "I joined a WhatsApp group for stock trading tips. They asked me to install an app "
+                     "and invest, showing 40% profit, but withdrawals are blocked unless I pay tax.",
+        "amount": 1200000, "suspect_url": "https://fake-trading-app.com", "bank_name": "HDFC Bank"
+    },
+    {
+        "complaint": "Someone sent me a QR code saying I would receive payment for my OLX sale, "
+                     "I scanned it and entered my UPI PIN and Rs 25000 got debited.",
+        "amount": 25000, "suspect_phone": "9876543210", "bank_name": "PhonePe"
+    },
+    {
+        "complaint": "Got a message offering part time job to like YouTube videos. After small payouts "
+                     "they asked for deposits for prepaid tasks and I lost my savings.",
+        "amount": 80000, "bank_name": "ICICI Bank"
+    }
+]
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_mode(mode: str, rounds: int) -> dict:
+    from graph import run_fraud_workflow
+
+    latencies, input_tokens, output_tokens, calls, errors = [], 0, 0, 0, 0
+    for _ in range(rounds):
+        for case in SAMPLE_CASES:
+            started = time.perf_counter()
+            result = await run_fraud_workflow({**case, "incident_date": "2026-01-15", "mode": mode})
+            latencies.append((time.perf_counter() - started) * 1000)
+
+            for usage in result.get("llm_usage", []):
+                calls += 1
+                input_tokens += usage["input_tokens"]
+                output_tokens += usage["output_tokens"]
+            errors += 1 if result.get("error") or getattr(result.get("report"), "llm_error", None) else 0
+
+    runs = len(latencies)
+    return {
+        "mode": mode,
+        "runs": runs,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 95),
+        "llm_calls_per_run": calls / runs,
+        "input_tokens_per_run": input_tokens / runs,
+        "output_tokens_per_run": output_tokens / runs,
+        "errors": errors
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare workflow modes")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=["standard", "fused", "speculative"])
+    args = parser.parse_args()
+
+    load_dotenv()
+    if not os.getenv("GOOGLE_API_KEY"):
+        raise SystemExit("GOOGLE_API_KEY is required for this benchmark")
+
+    print(f"{'mode':<10} {'runs':>5} {'p50 ms':>9} {'p95 ms':>9} {'calls':>6} {'in tok':>8} {'out tok':>8} {'errors':>7}")
+    for mode in args.modes:
+        r = await run_mode(mode, args.rounds)
+        print(
+            f"{r['mode']:<10} {r['runs']:>5} {r['p50_ms']:>9.0f} {r['p95_ms']:>9.0f} "
+            f"{r['llm_calls_per_run']:>6.1f} {r['input_tokens_per_run']:>8.0f} "
+            f"{r['output_tokens_per_run']:>8.0f} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
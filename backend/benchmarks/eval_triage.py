@@ -0,0 +1,162 @@
+"""
+Evaluation: triage engines, accuracy vs latency
+Replays a labeled complaint corpus through each triage engine in
+nodes.triage.TRIAGE_ENGINES and reports per-class precision/recall, the
+confusion matrix, throughput and latency percentiles side by side. The JSON
+output keeps every prediction with its confidence so thresholds can be tuned
+offline.
+
+Run from backend/ (llm/cached engines need GOOGLE_API_KEY):
+    python -m benchmarks.eval_triage [--engines rules cached llm] [--passes 2] [--out triage_eval.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from data.scam_types import SCAM_TYPES
+from nodes.triage import TRIAGE_ENGINES
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "triage_corpus.jsonl"
+LLM_ENGINES = ("llm", "cached")
+LABELS = [scam["id"] for scam in SCAM_TYPES] + ["other"]
+
+
+def load_corpus(path: Path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def classification_report(predictions: list) -> dict:
+    """Per-class precision/recall/F1, accuracy and the confusion matrix (true -> predicted -> count)"""
+    labels = sorted(set(LABELS) | {p["label"] for p in predictions} | {p["predicted"] for p in predictions})
+    confusion = {true: {pred: 0 for pred in labels} for true in labels}
+    for p in predictions:
+        confusion[p["label"]][p["predicted"]] += 1
+
+    per_class = {}
+    for label in labels:
+        tp = confusion[label][label]
+        predicted = sum(confusion[true][label] for true in labels)
+        support = sum(confusion[label].values())
+        precision = tp / predicted if predicted else 0.0
+        recall = tp / support if support else 0.0
+        per_class[label] = {
+            "precision": round(precision, 3),
+            "recall": round(recall, 3),
+            "f1": round(2 * precision * recall / (precision + recall), 3) if precision + recall else 0.0,
+            "support": support
+        }
+
+    correct = sum(1 for p in predictions if p["label"] == p["predicted"])
+    return {
+        "accuracy": round(correct / len(predictions), 3) if predictions else 0.0,
+        "per_class": per_class,
+        "confusion_matrix": confusion
+    }
+
+
+async def evaluate_engine(name: str, corpus: list, passes: int, concurrency: int) -> dict:
+    """Run the corpus `passes` times; metrics use the last pass, latency every pass"""
+    engine = TRIAGE_ENGINES[name]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def classify(item: dict) -> dict:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                delta = await engine(item["complaint"])
+                error = None
+            except Exception as e:
+                delta, error = {"scam_type": "other", "scam_confidence": 0.0}, str(e)
+            return {
+                "id": item["id"],
+                "label": item["label"],
+                "predicted": delta.get("scam_type", "other"),
+                "confidence": delta.get("scam_confidence"),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+                "llm_calls": len(delta.get("llm_usage", [])),
+                "error": error
+            }
+
+    passes_out = []
+    for _ in range(passes):
+        started = time.perf_counter()
+        predictions = await asyncio.gather(*(classify(item) for item in corpus))
+        passes_out.append({"elapsed_s": time.perf_counter() - started, "predictions": predictions})
+
+    last = passes_out[-1]["predictions"]
+    latencies = [p["latency_ms"] for run in passes_out for p in run["predictions"]]
+    total_s = sum(run["elapsed_s"] for run in passes_out)
+
+    return {
+        "engine": name,
+        **classification_report(last),
+        "throughput_per_s": round(len(latencies) / total_s, 1) if total_s else None,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies)
+        },
+        "llm_calls": sum(p["llm_calls"] for run in passes_out for p in run["predictions"]),
+        "errors": sum(1 for p in last if p["error"]),
+        "predictions": last
+    }
+
+
+def print_summary(results: list):
+    print(f"{'engine':<8}{'acc':>7}{'macro-F1':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'per s':>9}{'calls':>7}")
+    for r in results:
+        scored = [c for c in r["per_class"].values() if c["support"]]
+        macro_f1 = sum(c["f1"] for c in scored) / len(scored) if scored else 0.0
+        lat = r["latency_ms"]
+        print(f"{r['engine']:<8}{r['accuracy']:>7.2f}{macro_f1:>10.2f}{lat['p50']:>10.2f}{lat['p95']:>10.2f}"
+              f"{lat['p99']:>10.2f}{r['throughput_per_s']:>9}{r['llm_calls']:>7}")
+
+
+async def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Compare triage engines on a labeled corpus")
+    parser.add_argument("--engines", nargs="+", default=list(TRIAGE_ENGINES), choices=list(TRIAGE_ENGINES))
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--passes", type=int, default=2, help="Replays per engine (the cache warms on pass 1)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--out", type=Path, default=Path("triage_eval.json"))
+    args = parser.parse_args()
+
+    engines = list(args.engines)
+    if not os.getenv("GOOGLE_API_KEY"):
+        skipped = [name for name in engines if name in LLM_ENGINES]
+        engines = [name for name in engines if name not in LLM_ENGINES]
+        if skipped:
+            print(f"GOOGLE_API_KEY not set, skipping: {', '.join(skipped)}")
+    if not engines:
+        raise SystemExit("No engines to evaluate")
+
+    corpus = load_corpus(args.corpus)
+    results = [await evaluate_engine(name, corpus, args.passes, args.concurrency) for name in engines]
+
+    print_summary(results)
+    args.out.write_text(json.dumps({
+        "corpus": str(args.corpus),
+        "items": len(corpus),
+        "passes": args.passes,
+        "results": results
+    }, indent=2))
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Suspect Identifier Canonicalization
+Normalizes phones (E.164), hosts (IDNA / punycode), registrable domains and
+UPI handles so equivalent spellings of the same identifier compare equal
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs
+
+# Public suffixes seen in Indian fraud reports (multi-label entries first-class)
+PUBLIC_SUFFIXES = {
+    "com", "net", "org", "info", "biz", "in", "io", "co", "app", "xyz", "online", "site",
+    "top", "live", "shop", "club", "vip", "me", "cc", "tk",
+    "co.in", "net.in", "org.in", "firm.in", "gen.in", "ind.in", "gov.in", "nic.in", "ac.in", "edu.in", "res.in",
+    "co.uk", "org.uk", "com.au", "com.sg"
+}
+
+_UPI_HANDLE = re.compile(r"^[a-z0-9._-]{2,256}@[a-z][a-z0-9]{1,63}$")
+
+
+def canonical_phone(value: str) -> Optional[str]:
+    """E.164 form of an Indian (or explicitly international) number, else None"""
+    explicit_plus = value.strip().startswith("+")
+    digits = re.sub(r"\D", "", value)
+    if digits.startswith("00"):
+        digits, explicit_plus = digits[2:], True
+
+    if len(digits) == 10 and digits[0] in "6789":
+        return "+91" + digits
+    if len(digits) == 11 and digits.startswith("0") and digits[1] in "6789":
+        return "+91" + digits[1:]
+    if len(digits) == 12 and digits.startswith("91") and digits[2] in "6789":
+        return "+" + digits
+    if explicit_plus and 8 <= len(digits) <= 15:
+        return "+" + digits
+    return None
+
+
+def canonical_host(value: str) -> Optional[str]:
+    """Lowercase ASCII (punycode) hostname of a URL or bare domain, without www."""
+    candidate = value.strip().lower()
+    if not candidate:
+        return None
+    if "://" not in candidate:
+        candidate = "http://" + candidate
+
+    try:
+        host = urlsplit(candidate).hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+
+    host = host.rstrip(".")
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        pass
+
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+def registrable_domain(host: str) -> str:
+    """Public suffix plus one label, e.g. login.fake-trading-app.co.in -> fake-trading-app.co.in"""
+    labels = host.split(".")
+    for size in (3, 2, 1):
+        if len(labels) > size and ".".join(labels[-size:]) in PUBLIC_SUFFIXES:
+            return ".".join(labels[-(size + 1):])
+    return host
+
+
+def canonical_upi(value: str) -> Optional[str]:
+    """Lowercase UPI VPA, also accepting upi://pay?pa=... links"""
+    candidate = value.strip().lower()
+    if candidate.startswith("upi://"):
+        candidate = parse_qs(urlsplit(candidate).query).get("pa", [""])[0]
+    candidate = candidate.replace(" ", "")
+    return candidate if _UPI_HANDLE.match(candidate) else None
+
+
+@lru_cache(maxsize=4096)
+def canonicalize(suspect_type: str, value: str) -> Optional[str]:
+    """Canonical form of a phone / url / upi identifier, or None if unparseable"""
+    if suspect_type == "phone":
+        return canonical_phone(value)
+    if suspect_type == "url":
+        return canonical_host(value)
+    if suspect_type == "upi":
+        return canonical_upi(value)
+    return None
+
+
+class SuffixTrie:
+    """Domains keyed by reversed labels; a lookup matches the entry or any subdomain of it"""
+
+    __slots__ = ("_root",)
+    _ENTRY = "\0"
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, host: str, entry):
+        node = self._root
+        for label in reversed(host.split(".")):
+            node = node.setdefault(label, {})
+        node[self._ENTRY] = entry
+
+    def lookup(self, host: str):
+        """Most specific flagged entry covering host, in O(labels)"""
+        node = self._root
+        match = None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            match = node.get(self._ENTRY, match)
+        return match
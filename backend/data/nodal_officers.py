@@ -124,20 +124,20 @@ NODAL_OFFICERS = [
 ]
 
 
+# Lookup indexes built once at import (shared copy-on-write under the pre-fork server)
+_BANK_INDEX = tuple((officer["bank_name"].lower(), officer) for officer in NODAL_OFFICERS)
+_ALL_BANKS = tuple(sorted({officer["bank_name"] for officer in NODAL_OFFICERS}))
+
+
 def get_nodal_officer_by_bank(bank_name: str) -> list:
     """Find nodal officers for a specific bank"""
     bank_name_lower = bank_name.lower()
-    results = []
-    for officer in NODAL_OFFICERS:
-        if bank_name_lower in officer["bank_name"].lower():
-            results.append(officer)
-    return results
+    return [officer for name, officer in _BANK_INDEX if bank_name_lower in name]
 
 
 def get_all_banks() -> list:
     """Get unique list of all banks"""
-    banks = list(set([officer["bank_name"] for officer in NODAL_OFFICERS]))
-    return sorted(banks)
+    return list(_ALL_BANKS)
 
 
 def get_all_nodal_officers() -> list:
@@ -3,6 +3,10 @@ Scam Classification Types for Maharashtra Cyber Crime
 Based on common fraud patterns reported to 1930 helpline
 """
 
+import re
+
+from data.canonical import canonicalize, registrable_domain, SuffixTrie
+
 SCAM_TYPES = [
     {
         "id": "digital_arrest",
@@ -98,6 +102,27 @@ FLAGGED_SUSPECTS = [
 ]
 
 
+# Lookup indexes built once at import (shared copy-on-write under the pre-fork server)
+_SCAM_INDEX = {scam["id"]: scam for scam in SCAM_TYPES}
+_KEYWORD_PATTERNS = {
+    scam["id"]: [
+        (keyword, re.compile(r"\b" + re.escape(keyword) + r"\b"))
+        for keyword in scam["keywords"]
+    ]
+    for scam in SCAM_TYPES
+}
+# Phones and UPI handles by canonical value; domains in a suffix trie so subdomains match
+_SUSPECT_INDEX = {}
+_DOMAIN_TRIE = SuffixTrie()
+for _suspect in FLAGGED_SUSPECTS:
+    _canonical = canonicalize(_suspect["type"], _suspect["value"]) or _suspect["value"].lower()
+    if _suspect["type"] == "url":
+        _DOMAIN_TRIE.insert(_canonical, _suspect)
+    else:
+        _SUSPECT_INDEX[(_suspect["type"], _canonical)] = _suspect
+del _suspect, _canonical
+
+
 def get_scam_types() -> list:
     """Get all scam types"""
     return SCAM_TYPES
@@ -105,20 +130,82 @@ def get_scam_types() -> list:
 
 def get_scam_by_id(scam_id: str) -> dict:
     """Get scam details by ID"""
-    for scam in SCAM_TYPES:
-        if scam["id"] == scam_id:
-            return scam
-    return None
+    return _SCAM_INDEX.get(scam_id)
+
+
+def normalize_scam_type(value) -> str:
+    """Clamp a (possibly LLM-written) scam type to a known SCAM_TYPES id, else other"""
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in _SCAM_INDEX:
+            return value
+    return "other"
+
+
+def predict_scam_type(text: str) -> dict:
+    """
+    Classify a complaint locally from SCAM_TYPES keywords (no LLM)
+
+    Returns:
+        Triage-shaped dict: scam_type, confidence, urgency, key_indicators
+    """
+    text_lower = text.lower()
+    scores = []
+    for scam_id, patterns in _KEYWORD_PATTERNS.items():
+        matched = [keyword for keyword, pattern in patterns if pattern.search(text_lower)]
+        if matched:
+            scores.append((len(matched), scam_id, matched))
+    
+    if not scores:
+        return {"scam_type": "other", "confidence": 0.2, "urgency": "medium", "key_indicators": []}
+    
+    scores.sort(key=lambda item: item[0], reverse=True)
+    top_count, scam_id, matched = scores[0]
+    runner_up = scores[1][0] if len(scores) > 1 else 0
+    
+    return {
+        "scam_type": scam_id,
+        "confidence": round(min(0.9, 0.4 + 0.1 * (top_count - runner_up) + 0.05 * top_count), 2),
+        "urgency": _SCAM_INDEX[scam_id]["urgency"],
+        "key_indicators": matched
+    }
+
+
+def _lookup_suspect(suspect_type: str, canonical: str) -> dict:
+    if not canonical:
+        return None
+    if suspect_type == "url":
+        return _DOMAIN_TRIE.lookup(canonical)
+    return _SUSPECT_INDEX.get((suspect_type, canonical))
 
 
 def check_suspect(suspect_type: str, value: str) -> dict:
     """Check if a phone/URL/UPI is flagged in I4C repository"""
-    value_lower = value.lower().strip()
-    for suspect in FLAGGED_SUSPECTS:
-        if suspect["type"] == suspect_type and suspect["value"].lower() == value_lower:
-            return {
-                "found": True,
-                "reports": suspect["reports"],
-                "status": suspect["status"]
-            }
-    return {"found": False, "reports": 0, "status": "not_found"}
+    canonical = canonicalize(suspect_type, value.strip())
+    suspect = _lookup_suspect(suspect_type, canonical)
+    if suspect:
+        result = {
+            "found": True,
+            "reports": suspect["reports"],
+            "status": suspect["status"],
+            "canonical": canonical,
+            "matched": suspect["value"]
+        }
+        if suspect_type == "url":
+            result["registrable_domain"] = registrable_domain(canonical)
+        return result
+    return {"found": False, "reports": 0, "status": "not_found", "canonical": canonical}
+
+
+def check_suspects_batch(items: list) -> list:
+    """
+    Check many (suspect_type, value) pairs at once
+
+    Each distinct pair is canonicalized and looked up once; results come back
+    in input order.
+    """
+    results = {}
+    for suspect_type, value in items:
+        if (suspect_type, value) not in results:
+            results[(suspect_type, value)] = check_suspect(suspect_type, value)
+    return [results[(suspect_type, value)] for suspect_type, value in items]
@@ -3,18 +3,40 @@ LangGraph Workflow Definition
 Multi-step agent workflow for cyber fraud reporting
 """
 
+import operator
+import threading
+import uuid
 from typing import TypedDict, List, Optional, Annotated
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
+
+from services import pending
+from services.llm import request_deadline
 
 # Import nodes
 from nodes.triage import triage_auditor
 from nodes.evidence import evidence_collector
 from nodes.router import nodal_router
 from nodes.reporter import portal_reporter
+from nodes.fused import fused_triage_reporter, deterministic_stages, finalize
+from nodes.speculative import speculative_triage_reporter
+from nodes.results import EvidenceResult, RoutingResult, ReportResult
+
+
+WORKFLOW_MODES = ("standard", "fused", "speculative")
+
+
+def _latest(current, update):
+    """Reducer for keys that parallel branches may both write"""
+    return update
 
 
 class FraudReportState(TypedDict, total=False):
-    """State schema for the fraud reporting workflow"""
+    """
+    State schema for the fraud reporting workflow
+
+    Nodes return only the keys they change; LangGraph merges those deltas
+    into the running state instead of copying the whole state per node.
+    """
     # Input fields
     complaint: str
     utr: Optional[str]
@@ -35,25 +57,34 @@ class FraudReportState(TypedDict, total=False):
     triage_complete: Optional[bool]
     
     # Node 2: Evidence outputs
-    evidence: Optional[dict]
+    evidence: Optional[EvidenceResult]
     evidence_complete: Optional[bool]
     
     # Node 3: Router outputs
-    routing: Optional[dict]
+    routing: Optional[RoutingResult]
     routing_complete: Optional[bool]
     
     # Node 4: Reporter outputs
-    report: Optional[dict]
+    report: Optional[ReportResult]
     report_complete: Optional[bool]
     
+    # Speculative mode outputs
+    speculation: Optional[dict]
+    
     # Workflow state
-    current_node: Optional[str]
+    case_id: Optional[str]
+    workflow_mode: Optional[str]
+    pipeline_mode: Optional[str]
+    degradation: Optional[dict]
+    deadline: Optional[float]
+    llm_usage: Annotated[List[dict], operator.add]
+    current_node: Annotated[Optional[str], _latest]
     workflow_complete: Optional[bool]
-    error: Optional[str]
+    error: Annotated[Optional[str], _latest]
 
 
 def create_fraud_workflow():
-    """Create and compile the LangGraph workflow"""
+    """Create and compile the LangGraph workflow (standard two-call mode)"""
     
     # Initialize the graph with state schema
     workflow = StateGraph(FraudReportState)
@@ -79,8 +110,67 @@ def create_fraud_workflow():
     return app
 
 
-# Create the workflow instance
-fraud_workflow = create_fraud_workflow()
+def create_fused_workflow():
+    """
+    Create and compile the fused workflow: one LLM call for triage and report,
+    with evidence and routing running in parallel and urgency applied at the end
+    """
+    
+    workflow = StateGraph(FraudReportState)
+    
+    workflow.add_node("fused", fused_triage_reporter)
+    workflow.add_node("deterministic", deterministic_stages)
+    workflow.add_node("finalize", finalize)
+    
+    # Fan out from the start, join before finalize
+    workflow.add_edge(START, "fused")
+    workflow.add_edge(START, "deterministic")
+    workflow.add_edge(["fused", "deterministic"], "finalize")
+    workflow.add_edge("finalize", END)
+    
+    return workflow.compile()
+
+
+def create_speculative_workflow():
+    """
+    Create and compile the speculative workflow: evidence first, then LLM triage
+    with the report call started concurrently on a keyword-predicted scam type
+    """
+    
+    workflow = StateGraph(FraudReportState)
+    
+    workflow.add_node("evidence", evidence_collector)
+    workflow.add_node("speculative", speculative_triage_reporter)
+    workflow.add_node("router", nodal_router)
+    
+    workflow.set_entry_point("evidence")
+    workflow.add_edge("evidence", "speculative")
+    workflow.add_edge("speculative", "router")
+    workflow.add_edge("router", END)
+    
+    return workflow.compile()
+
+
+_WORKFLOW_BUILDERS = {
+    "standard": create_fraud_workflow,
+    "fused": create_fused_workflow,
+    "speculative": create_speculative_workflow
+}
+
+# Workflows are compiled on first use (or by the startup warm-up), not at import
+_compiled_workflows = {}
+_compile_lock = threading.Lock()
+
+
+def get_fraud_workflow(mode: str = "standard"):
+    """Return the compiled workflow for a mode, compiling it once on first call"""
+    
+    if mode not in _compiled_workflows:
+        with _compile_lock:
+            if mode not in _compiled_workflows:
+                _compiled_workflows[mode] = _WORKFLOW_BUILDERS[mode]()
+    
+    return _compiled_workflows[mode]
 
 
 async def run_fraud_workflow(input_data: dict) -> dict:
@@ -88,14 +178,18 @@ async def run_fraud_workflow(input_data: dict) -> dict:
     Execute the complete fraud reporting workflow
     
     Args:
-        input_data: Dictionary containing complaint and evidence details
+        input_data: Dictionary containing complaint and evidence details,
+            plus an optional "mode" (see WORKFLOW_MODES)
         
     Returns:
         Final state with all node outputs
     """
     
+    mode = input_data.get("mode") or "standard"
+    
     # Initialize state with input data
     initial_state = {
+        "case_id": input_data.get("case_id") or uuid.uuid4().hex,
         "complaint": input_data.get("complaint", ""),
         "utr": input_data.get("utr"),
         "bank_name": input_data.get("bank_name"),
@@ -105,6 +199,11 @@ async def run_fraud_workflow(input_data: dict) -> dict:
         "incident_date": input_data.get("incident_date"),
         "victim_name": input_data.get("victim_name"),
         "victim_phone": input_data.get("victim_phone"),
+        "workflow_mode": mode,
+        "pipeline_mode": input_data.get("pipeline_mode") or "full",
+        "degradation": input_data.get("degradation"),
+        "deadline": request_deadline(),
+        "llm_usage": [],
         
         # Initialize completion flags
         "triage_complete": False,
@@ -115,6 +214,11 @@ async def run_fraud_workflow(input_data: dict) -> dict:
     }
     
     # Run the workflow
-    final_state = await fraud_workflow.ainvoke(initial_state)
+    try:
+        final_state = await get_fraud_workflow(mode).ainvoke(initial_state)
+    except BaseException:
+        pending.discard(initial_state["case_id"])
+        raise
     
-    return final_state
+    # Fields that streamed in after their node had already returned (e.g. triage reasoning)
+    return pending.merge_late(final_state, await pending.resolve(initial_state["case_id"]))
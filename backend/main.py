@@ -4,22 +4,37 @@ Main application with REST endpoints
 """
 
 import os
-from typing import Optional
+import hmac
+import hashlib
+import asyncio
+import tracemalloc
+from typing import Optional, Literal
 from datetime import datetime
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Header, Request
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 
 # Load environment variables
 load_dotenv()
 
-# Import workflow and data
-from graph import run_fraud_workflow
+# Import data (the LangGraph workflow and LLM stack are imported lazily)
 from data.nodal_officers import get_all_nodal_officers, get_nodal_officer_by_bank, get_all_banks
 from data.scam_types import get_scam_types, get_scam_by_id, check_suspect
+from nodes.results import to_payload
+from services.coalescer import RequestCoalescer, IdempotencyKeyConflict, payload_key
+from services.warmup import warm_up, skip_warm_up, mark_ready, readiness
+from services import metrics
+from services.rollups import RollupStore
+from services.degradation import controller as degradation
+from services.sessions import SessionStore
+from services import profiler
+from services.ratelimit import RateLimiter, DEFAULT_RATE_LIMITS
+from services.llm import breaker as llm_breaker
+from services.negotiation import NegotiatedResponse, NegotiatedRoute
 
 
 def get_api_key(x_api_key: Optional[str] = None) -> Optional[str]:
@@ -29,13 +44,186 @@ def get_api_key(x_api_key: Optional[str] = None) -> Optional[str]:
     return os.getenv("GOOGLE_API_KEY")
 
 
+# Nodal officer email escalation (opt-in, needs an SMTP server)
+ESCALATION_ENABLED = os.getenv("ESCALATION_ENABLED", "false").lower() == "true"
+escalation_dispatcher = None
+
+# Dashboard rollups, updated as each workflow completes; one SQLite file shared by all workers
+rollups = RollupStore(
+    os.getenv("ROLLUP_PATH", "rollups.sqlite3"),
+    hourly_retention_hours=int(os.getenv("ROLLUP_HOURLY_RETENTION_HOURS", "72")),
+    daily_retention_days=int(os.getenv("ROLLUP_DAILY_RETENTION_DAYS", "400"))
+)
+
+# Analyzed cases are spooled for offline Parquet export when a directory is configured
+CASE_SPOOL_DIR = os.getenv("CASE_SPOOL_DIR")
+case_spool = None
+if CASE_SPOOL_DIR:
+    from services.export import CaseSpool
+    case_spool = CaseSpool(CASE_SPOOL_DIR)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the workflow in the background so startup is not blocked"""
+    global escalation_dispatcher
+    background_tasks = []
+    
+    # Workflow runs execute in their own task, outside the endpoint's frames
+    profiler.set_routes(app.routes, {"execute_workflow": "/api/analyze"})
+    
+    if os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true":
+        background_tasks.append(asyncio.create_task(warm_up()))
+    else:
+        skip_warm_up()
+    
+    if ESCALATION_ENABLED:
+        from services.outbox import Outbox
+        from services.escalation import EscalationDispatcher
+        
+        escalation_dispatcher = EscalationDispatcher(Outbox(
+            os.getenv("OUTBOX_PATH", "outbox.sqlite3"),
+            max_attempts=int(os.getenv("ESCALATION_MAX_ATTEMPTS", "5")),
+            lease_seconds=float(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+        ))
+        background_tasks.append(asyncio.create_task(escalation_dispatcher.run_forever()))
+    
+    yield
+    
+    for task in background_tasks:
+        if not task.done():
+            task.cancel()
+    if escalation_dispatcher:
+        await escalation_dispatcher.pool.close()
+    rollups.close()
+
+
+async def escalate_case(result: dict):
+    """Queue nodal officer emails for a finished case"""
+    if escalation_dispatcher:
+        result["escalation"] = {"queued": await escalation_dispatcher.enqueue_case(result)}
+
+
+def _write_case(result: dict):
+    rollups.record(result)
+    
+    if case_spool:
+        try:
+            case_spool.append(result)
+        except Exception as e:
+            print(f"Case spool error: {e}")
+
+
+async def record_case(result: dict):
+    """Count a finished case in the rollups and spool it for export (blocking writes run in a worker thread)"""
+    await asyncio.to_thread(_write_case, result)
+
+
+async def execute_workflow(input_data: dict) -> dict:
+    """Run the workflow once and apply side effects (shared by coalesced duplicates)"""
+    from graph import run_fraud_workflow
+    
+    pipeline_mode, transition = degradation.evaluate()
+    result = await run_fraud_workflow({
+        **input_data,
+        "pipeline_mode": pipeline_mode,
+        "degradation": {"mode": pipeline_mode, "transition": transition}
+    })
+    
+    if input_data.get("escalate"):
+        await escalate_case(result)
+    await record_case(result)
+    
+    return result
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Guard for admin endpoints: X-Admin-Token must match ADMIN_TOKEN"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Cyber-Suraksha API",
     description="AI-powered First Responder for Financial Fraud Recovery",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=NegotiatedResponse
+)
+
+# Every route accepts MessagePack bodies and answers in MessagePack when Accept asks for it
+app.router.route_class = NegotiatedRoute
+
+# Duplicate /api/analyze submissions share one workflow run and replay its result
+analyze_coalescer = RequestCoalescer(
+    ttl_seconds=float(os.getenv("ANALYZE_REPLAY_TTL_SECONDS", "300")),
+    max_entries=int(os.getenv("ANALYZE_REPLAY_MAX_ENTRIES", "1024"))
 )
 
+# Wizard sessions keep workflow state server-side and re-run only affected nodes
+sessions = SessionStore(
+    ttl_seconds=float(os.getenv("SESSION_TTL_SECONDS", "3600")),
+    max_entries=int(os.getenv("SESSION_MAX_ENTRIES", "1024"))
+)
+
+# Duplicate session creations (double-clicked first submit) share one session
+session_coalescer = RequestCoalescer(
+    ttl_seconds=float(os.getenv("ANALYZE_REPLAY_TTL_SECONDS", "300")),
+    max_entries=int(os.getenv("ANALYZE_REPLAY_MAX_ENTRIES", "1024"))
+)
+
+# Per-route GCRA limits by client IP and API key, enforced before any workflow/LLM work
+rate_limiter = RateLimiter(os.getenv("RATE_LIMITS", DEFAULT_RATE_LIMITS))
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+TRUSTED_PROXY_HOPS = max(1, int(os.getenv("TRUSTED_PROXY_HOPS", "1")))
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address, from X-Forwarded-For only when running behind trusted proxies
+    
+    Each proxy appends the address it received the request from, so only the
+    last TRUSTED_PROXY_HOPS entries can be trusted; anything left of them was
+    sent by the client. Fewer entries than hops means the request bypassed a
+    proxy, so the peer address is used.
+    """
+    if TRUST_PROXY_HEADERS:
+        forwarded = [
+            hop.strip() for header in request.headers.getlist("x-forwarded-for")
+            for hop in header.split(",") if hop.strip()
+        ]
+        if len(forwarded) >= TRUSTED_PROXY_HOPS:
+            return forwarded[-TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+def caller_scope(request: Request) -> str:
+    """Namespace for idempotency keys: the caller's API key if sent, else its IP"""
+    api_key = request.headers.get("x-api-key")
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return "ip:" + client_ip(request)
+
+
+# Registered before CORS so CORS headers are added to 429 responses too
+@app.middleware("http")
+async def rate_limit(request: Request, call_next):
+    allowed, retry_after, scope = rate_limiter.admit(
+        request.url.path, client_ip(request), request.headers.get("x-api-key"), request.method
+    )
+    if not allowed:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": f"Rate limit exceeded ({scope}). Retry in {retry_after}s", "retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)}
+        )
+    return await call_next(request)
+
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -48,9 +236,31 @@ app.add_middleware(
 
 # ============ Pydantic Models ============
 
+COMPLAINT_MAX_CHARS = int(os.getenv("COMPLAINT_MAX_CHARS", "100000"))
+
+
 class FraudReportRequest(BaseModel):
     """Request model for fraud report submission"""
-    complaint: str = Field(..., min_length=10, description="Description of the fraud")
+    complaint: str = Field(..., min_length=10, max_length=COMPLAINT_MAX_CHARS, description="Description of the fraud")
+    utr: Optional[str] = Field(None, description="Transaction reference number")
+    bank_name: Optional[str] = Field(None, description="Bank involved")
+    amount: Optional[float] = Field(None, ge=0, description="Amount lost in rupees")
+    suspect_phone: Optional[str] = Field(None, description="Suspect's phone number")
+    suspect_url: Optional[str] = Field(None, description="Fraudulent URL or app name")
+    incident_date: Optional[str] = Field(None, description="Date of incident (YYYY-MM-DD)")
+    victim_name: Optional[str] = Field(None, description="Victim's name")
+    victim_phone: Optional[str] = Field(None, description="Victim's contact number")
+    escalate: bool = Field(False, description="Email the report to every routed nodal officer")
+    mode: Literal["standard", "fused", "speculative"] = Field(
+        "standard",
+        description="Workflow mode: two sequential LLM calls, one fused triage+report call, "
+                    "or report generation overlapped with triage"
+    )
+
+
+class SessionRequest(BaseModel):
+    """Request model for wizard session fields (all optional; PATCH sends only changes)"""
+    complaint: Optional[str] = Field(None, max_length=COMPLAINT_MAX_CHARS, description="Description of the fraud")
     utr: Optional[str] = Field(None, description="Transaction reference number")
     bank_name: Optional[str] = Field(None, description="Bank involved")
     amount: Optional[float] = Field(None, ge=0, description="Amount lost in rupees")
@@ -59,11 +269,12 @@ class FraudReportRequest(BaseModel):
     incident_date: Optional[str] = Field(None, description="Date of incident (YYYY-MM-DD)")
     victim_name: Optional[str] = Field(None, description="Victim's name")
     victim_phone: Optional[str] = Field(None, description="Victim's contact number")
+    escalate: Optional[bool] = Field(None, description="Email the report to every routed nodal officer once complete")
 
 
 class TriageRequest(BaseModel):
     """Request model for triage analysis only"""
-    complaint: str = Field(..., min_length=10, description="Description of the fraud")
+    complaint: str = Field(..., min_length=10, max_length=COMPLAINT_MAX_CHARS, description="Description of the fraud")
 
 
 class SuspectCheckRequest(BaseModel):
@@ -77,6 +288,13 @@ class NodalLookupRequest(BaseModel):
     bank_name: str = Field(..., description="Bank name to lookup")
 
 
+class ExportRequest(BaseModel):
+    """Request model for a Parquet export of spooled cases"""
+    since: Optional[str] = Field(None, description="First day to export (YYYY-MM-DD)")
+    until: Optional[str] = Field(None, description="Last day to export (YYYY-MM-DD)")
+    row_group_size: int = Field(10000, ge=100, description="Rows per Parquet row group")
+
+
 # ============ API Endpoints ============
 
 @app.get("/")
@@ -100,10 +318,33 @@ async def health_check(x_api_key: Optional[str] = Header(None)):
         "status": "healthy" if api_key_configured else "degraded",
         "llm_configured": api_key_configured,
         "api_key_source": "header" if x_api_key else ("env" if os.getenv("GOOGLE_API_KEY") else "none"),
+        "analyze_coalescing": analyze_coalescer.stats(),
+        "session_coalescing": session_coalescer.stats(),
+        "sessions": sessions.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "pipeline": degradation.status(),
+        "llm_circuit": llm_breaker.status(),
         "timestamp": datetime.now().isoformat()
     }
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """In-process workflow metrics (speculation hit rate, saved time, ...)"""
+    return {
+        "success": True,
+        "pid": os.getpid(),
+        "metrics": metrics.snapshot()
+    }
+
+
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the fraud workflow is loaded, 503 before"""
+    status = readiness()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
 @app.post("/api/test-key")
 async def test_api_key(x_api_key: Optional[str] = Header(None)):
     """Test if API key is valid by making a simple LLM call"""
@@ -135,8 +376,33 @@ async def test_api_key(x_api_key: Optional[str] = Header(None)):
         }
 
 
+def workflow_data(result: dict) -> dict:
+    """Shape a workflow result for API responses"""
+    return {
+        "triage": {
+            "scam_type": result.get("scam_type"),
+            "confidence": result.get("scam_confidence"),
+            "urgency": result.get("urgency"),
+            "reasoning": result.get("scam_reasoning"),
+            "indicators": result.get("key_indicators", [])
+        },
+        "evidence": to_payload(result.get("evidence")),
+        "routing": to_payload(result.get("routing")),
+        "report": to_payload(result.get("report")),
+        "llm_usage": result.get("llm_usage", []),
+        "speculation": result.get("speculation"),
+        "escalation": result.get("escalation"),
+        "degradation": result.get("degradation")
+    }
+
+
 @app.post("/api/analyze")
-async def analyze_fraud(request: FraudReportRequest, x_api_key: Optional[str] = Header(None)):
+async def analyze_fraud(
+    request: FraudReportRequest,
+    http_request: Request,
+    x_api_key: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None)
+):
     """
     Run the complete 4-node fraud analysis workflow
     
@@ -145,6 +411,10 @@ async def analyze_fraud(request: FraudReportRequest, x_api_key: Optional[str] =
     2. Evidence Collector - Validate evidence
     3. Nodal Router - Find bank contacts
     4. Portal Reporter - Generate report
+    
+    Duplicate submissions from the same caller (same Idempotency-Key header,
+    or same payload) join the in-flight run or replay its result within the
+    TTL window. Reusing an Idempotency-Key for a different payload is a 422.
     """
     # Set API key from header if provided
     api_key = get_api_key(x_api_key)
@@ -161,32 +431,158 @@ async def analyze_fraud(request: FraudReportRequest, x_api_key: Optional[str] =
             "suspect_url": request.suspect_url,
             "incident_date": request.incident_date or datetime.now().strftime("%Y-%m-%d"),
             "victim_name": request.victim_name,
-            "victim_phone": request.victim_phone
+            "victim_phone": request.victim_phone,
+            "mode": request.mode,
+            "escalate": request.escalate
         }
         
-        result = await run_fraud_workflow(input_data)
+        # Keys are scoped to the caller and bound to the payload they were first used with
+        fingerprint = payload_key(input_data)
+        scope = caller_scope(http_request)
+        key = f"idempotency:{scope}:{idempotency_key}" if idempotency_key else f"{scope}:{fingerprint}"
+        with profiler.continuous.maybe_sample():
+            result, coalesce_status = await analyze_coalescer.run(
+                key, lambda: execute_workflow(input_data), fingerprint
+            )
+        mark_ready()
         
-        return {
-            "success": True,
-            "workflow_complete": result.get("workflow_complete", False),
-            "data": {
-                "triage": {
-                    "scam_type": result.get("scam_type"),
-                    "confidence": result.get("scam_confidence"),
-                    "urgency": result.get("urgency"),
-                    "reasoning": result.get("scam_reasoning"),
-                    "indicators": result.get("key_indicators", [])
-                },
-                "evidence": result.get("evidence", {}),
-                "routing": result.get("routing", {}),
-                "report": result.get("report", {})
-            }
-        }
+        # Returned as a response so FastAPI does not run jsonable_encoder over the whole result
+        return NegotiatedResponse(
+            content={
+                "success": True,
+                "workflow_complete": result.get("workflow_complete", False),
+                "mode": result.get("workflow_mode"),
+                "pipeline_mode": result.get("pipeline_mode"),
+                "case_id": result.get("case_id"),
+                "data": workflow_data(result)
+            },
+            headers={"X-Coalesce-Status": coalesce_status}
+        )
         
+    except IdempotencyKeyConflict:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Workflow error: {str(e)}")
 
 
+def session_payload(session, changed_fields: list = None) -> dict:
+    """Shape a wizard session for API responses"""
+    result = session.state
+    return {
+        "success": True,
+        "session_id": session.session_id,
+        "case_id": session.case_id,
+        "version": session.version,
+        "changed_fields": changed_fields or [],
+        "workflow_complete": result.get("workflow_complete", False),
+        "pipeline_mode": result.get("pipeline_mode"),
+        "nodes": result.get("nodes", {}),
+        "data": workflow_data(result)
+    }
+
+
+async def evaluate_session(session) -> dict:
+    """
+    Re-run the nodes of a session whose inputs changed
+    
+    The first time a session's workflow completes, the case is counted in the
+    rollups and spooled like an /api/analyze case; escalation is queued once,
+    as soon as the session is complete and escalation was requested.
+    """
+    pipeline_mode, transition = degradation.evaluate()
+    try:
+        result = await session.evaluate(pipeline_mode)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Workflow error: {str(e)}")
+    result["degradation"] = {"mode": pipeline_mode, "transition": transition}
+    
+    if result.get("workflow_complete"):
+        if session.escalate and session.escalation is None:
+            await escalate_case(result)
+            session.escalation = result.get("escalation")
+        if not session.recorded:
+            await record_case(result)
+            session.recorded = True
+    result["escalation"] = session.escalation
+    return result
+
+
+@app.post("/api/sessions")
+async def create_session(
+    request: SessionRequest,
+    http_request: Request,
+    response: Response,
+    x_api_key: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None)
+):
+    """
+    Start a wizard session with whatever fields are known so far
+    
+    Nodes that need a complaint stay "waiting" until one is patched in.
+    Duplicate creations from the same caller (same Idempotency-Key, or same
+    fields) share one session, like duplicate /api/analyze submissions.
+    """
+    api_key = get_api_key(x_api_key)
+    if api_key:
+        os.environ["GOOGLE_API_KEY"] = api_key
+    
+    fields = request.model_dump()
+    
+    async def start_session() -> dict:
+        session = sessions.create(fields)
+        session.escalate = bool(fields.get("escalate"))
+        async with session.lock:
+            await evaluate_session(session)
+            return session_payload(session)
+    
+    fingerprint = payload_key(fields)
+    scope = caller_scope(http_request)
+    key = f"idempotency:{scope}:{idempotency_key}" if idempotency_key else f"{scope}:{fingerprint}"
+    try:
+        payload, coalesce_status = await session_coalescer.run(key, start_session, fingerprint)
+    except IdempotencyKeyConflict:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+    
+    response.headers["X-Coalesce-Status"] = coalesce_status
+    return payload
+
+
+@app.patch("/api/sessions/{session_id}")
+async def patch_session(session_id: str, request: SessionRequest, x_api_key: Optional[str] = Header(None)):
+    """
+    Update session fields and re-run only the nodes downstream of the changes
+    
+    Each node is memoized on a hash of its inputs: editing suspect_phone
+    re-runs evidence (and router/reporter only if its output changed), never triage.
+    """
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    
+    api_key = get_api_key(x_api_key)
+    if api_key:
+        os.environ["GOOGLE_API_KEY"] = api_key
+    
+    changes = request.model_dump(exclude_unset=True)
+    async with session.lock:
+        changed_fields = session.patch(changes)
+        escalation_requested = changes.get("escalate") and not session.escalate
+        session.escalate = session.escalate or bool(changes.get("escalate"))
+        if changed_fields or escalation_requested or not session.state.get("workflow_complete"):
+            await evaluate_session(session)
+        return session_payload(session, changed_fields)
+
+
+@app.get("/api/sessions/{session_id}")
+async def get_session(session_id: str):
+    """Current fields and results of a wizard session (no re-evaluation)"""
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    
+    return {**session_payload(session), "fields": session.fields}
+
+
 @app.post("/api/triage")
 async def triage_only(request: TriageRequest, x_api_key: Optional[str] = Header(None)):
     """Quick triage analysis without full workflow"""
@@ -243,6 +639,42 @@ async def check_suspect_endpoint(request: SuspectCheckRequest):
     }
 
 
+@app.get("/api/outbox/{message_id}")
+async def get_outbox_message(message_id: int):
+    """Delivery status of a queued escalation email"""
+    if not escalation_dispatcher:
+        raise HTTPException(status_code=404, detail="Escalation is not enabled")
+    
+    message = escalation_dispatcher.outbox.get(message_id)
+    if not message:
+        raise HTTPException(status_code=404, detail=f"Outbox message {message_id} not found")
+    
+    return {"success": True, "message": message}
+
+
+@app.get("/api/cases/{case_id}/escalations")
+async def get_case_escalations(case_id: str):
+    """Delivery status of every escalation email for a case"""
+    if not escalation_dispatcher:
+        raise HTTPException(status_code=404, detail="Escalation is not enabled")
+    
+    messages = escalation_dispatcher.outbox.list_case(case_id)
+    return {"success": True, "case_id": case_id, "messages": messages, "count": len(messages)}
+
+
+@app.get("/api/stats")
+async def get_stats(dimension: str = "scam_type", granularity: str = "hour", hours: int = 24):
+    """Complaint counts and rupees lost per dimension over the last `hours`"""
+    since = datetime.now().timestamp() - hours * 3600
+    
+    try:
+        stats = rollups.query(dimension, granularity=granularity, since=since)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"success": True, **stats}
+
+
 @app.get("/api/scam-types")
 async def get_all_scam_types():
     """Get list of all scam categories"""
@@ -284,6 +716,114 @@ async def get_all_officers():
     }
 
 
+# ============ Admin Endpoints ============
+
+def run_export(request: ExportRequest):
+    """Background task: export spooled cases to Parquet"""
+    from services.export import export_parquet
+    
+    try:
+        summary = export_parquet(
+            CASE_SPOOL_DIR,
+            os.getenv("CASE_EXPORT_DIR", "exports"),
+            row_group_size=request.row_group_size,
+            since=request.since,
+            until=request.until
+        )
+        print(f"Case export finished: {summary['rows']} rows, {len(summary['files'])} files")
+    except Exception as e:
+        print(f"Case export error: {e}")
+
+
+@app.post("/api/admin/export", dependencies=[Depends(require_admin)])
+async def export_cases(request: ExportRequest, background_tasks: BackgroundTasks):
+    """Start a Parquet export of spooled cases in the background"""
+    if not CASE_SPOOL_DIR:
+        raise HTTPException(status_code=400, detail="Case spooling is not enabled (CASE_SPOOL_DIR not set)")
+    
+    background_tasks.add_task(run_export, request)
+    
+    return {
+        "success": True,
+        "message": "Export started",
+        "output_dir": os.getenv("CASE_EXPORT_DIR", "exports")
+    }
+
+
+# One on-demand profile at a time; each runs for a bounded window
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+profile_lock = asyncio.Lock()
+
+
+@app.post("/api/admin/profile/cpu", dependencies=[Depends(require_admin)])
+async def profile_cpu(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    format: Literal["json", "folded"] = "json"
+):
+    """
+    Sample every thread's stack for a bounded window
+    
+    format=folded returns flamegraph.pl / speedscope input, each stack
+    prefixed with route:<path>;node:<workflow node>.
+    """
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    
+    seconds = min(seconds, PROFILE_MAX_SECONDS)
+    sampler = profiler.SamplingProfiler(interval_ms=interval_ms)
+    async with profile_lock:
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            sampler.stop()
+    
+    if format == "folded":
+        return PlainTextResponse(sampler.folded())
+    return {"success": True, "seconds": seconds, **sampler.report()}
+
+
+@app.post("/api/admin/profile/memory", dependencies=[Depends(require_admin)])
+async def profile_memory(seconds: float = Query(10, gt=0), top: int = Query(25, ge=1, le=500)):
+    """Diff tracemalloc snapshots taken at the start and end of a bounded window"""
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    
+    seconds = min(seconds, PROFILE_MAX_SECONDS)
+    async with profile_lock:
+        started = profiler.start_tracing()
+        try:
+            before = profiler.take_snapshot()
+            await asyncio.sleep(seconds)
+            after = profiler.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+    
+    return {
+        "success": True,
+        "seconds": seconds,
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "top": profiler.allocation_diff(before, after, top)
+    }
+
+
+@app.get("/api/admin/profile/continuous", dependencies=[Depends(require_admin)])
+async def profile_continuous(format: Literal["json", "folded"] = "json", reset: bool = False):
+    """Stacks accumulated from the PROFILE_SAMPLE_RATE fraction of /api/analyze requests"""
+    if format == "folded":
+        response = PlainTextResponse(profiler.continuous.profiler.folded())
+    else:
+        response = {"success": True, **profiler.continuous.report()}
+    
+    if reset:
+        profiler.continuous.profiler.reset()
+    return response
+
+
 # ============ Run Server ============
 
 if __name__ == "__main__":
@@ -4,7 +4,10 @@ Validates and enriches evidence data (UTR, bank info, suspect details)
 """
 
 import re
-from data.scam_types import check_suspect
+from data.canonical import canonicalize
+from data.scam_types import check_suspects_batch
+from services.entities import extract_entities
+from nodes.results import EvidenceResult
 
 
 def validate_utr(utr: str) -> dict:
@@ -69,8 +72,8 @@ def extract_bank_from_utr(utr: str) -> str:
 async def evidence_collector(state: dict) -> dict:
     """
     Node 2: Validate and enrich evidence data
-    Input: utr, bank_name, suspect_phone, suspect_url
-    Output: validated data with I4C check results
+    Input: utr, bank_name, suspect_phone, suspect_url, complaint
+    Output: validated data with I4C check results (state delta only)
     """
     
     utr = state.get("utr", "")
@@ -79,21 +82,22 @@ async def evidence_collector(state: dict) -> dict:
     suspect_url = state.get("suspect_url", "")
     amount = state.get("amount", 0)
     
-    evidence_result = {
-        "utr_validated": False,
-        "utr_info": {},
-        "bank_identified": None,
-        "suspect_checks": [],
-        "evidence_score": 0
-    }
+    evidence_result = EvidenceResult()
+    evidence_result.entities = extract_entities(state.get("complaint", ""))
+    
+    # Fall back to the first UTR / amount mentioned in the complaint text
+    if not utr:
+        utr = next((e["canonical"] for e in evidence_result.entities if e["type"] == "utr"), "")
+    if not amount:
+        amount = next((e["canonical"] for e in evidence_result.entities if e["type"] == "amount"), 0)
     
     score = 0
     
     # Validate UTR
     if utr:
         utr_validation = validate_utr(utr)
-        evidence_result["utr_info"] = utr_validation
-        evidence_result["utr_validated"] = utr_validation["valid"]
+        evidence_result.utr_info = utr_validation
+        evidence_result.utr_validated = utr_validation["valid"]
         if utr_validation["valid"]:
             score += 30
             
@@ -102,42 +106,44 @@ async def evidence_collector(state: dict) -> dict:
                 extracted_bank = extract_bank_from_utr(utr)
                 if extracted_bank:
                     bank_name = extracted_bank
-                    evidence_result["bank_identified"] = extracted_bank
+                    evidence_result.bank_identified = extracted_bank
     
     # Validate bank
     if bank_name:
-        evidence_result["bank_name"] = bank_name
+        evidence_result.bank_name = bank_name
         score += 20
     
-    # Check suspect phone in I4C repository
+    # Check suspects in I4C repository (canonical forms, one batch):
+    # form fields first, then identifiers harvested from the complaint
+    suspects = {}
     if suspect_phone:
-        phone_clean = re.sub(r"[^\d]", "", suspect_phone)
-        if len(phone_clean) == 10:
-            phone_check = check_suspect("phone", phone_clean)
-            evidence_result["suspect_checks"].append({
-                "type": "phone",
-                "value": phone_clean,
-                "result": phone_check
-            })
-            if phone_check["found"]:
-                score += 25
-    
-    # Check suspect URL in I4C repository
+        phone_canonical = canonicalize("phone", suspect_phone)
+        if phone_canonical:
+            suspects[("phone", phone_canonical)] = {"source": "form"}
     if suspect_url:
-        url_clean = suspect_url.lower().replace("http://", "").replace("https://", "").split("/")[0]
-        url_check = check_suspect("url", url_clean)
-        evidence_result["suspect_checks"].append({
-            "type": "url",
-            "value": url_clean,
-            "result": url_check
+        url_canonical = canonicalize("url", suspect_url)
+        if url_canonical:
+            suspects[("url", url_canonical)] = {"source": "form"}
+    for entity in evidence_result.entities:
+        if entity["type"] in ("phone", "url", "upi"):
+            entry = suspects.setdefault((entity["type"], entity["canonical"]), {"source": "complaint"})
+            entry.setdefault("spans", []).append(entity["span"])
+    
+    keys = list(suspects)
+    for (suspect_type, value), check in zip(keys, check_suspects_batch(keys)):
+        evidence_result.suspect_checks.append({
+            "type": suspect_type,
+            "value": value,
+            "result": check,
+            **suspects[(suspect_type, value)]
         })
-        if url_check["found"]:
+        if check["found"]:
             score += 25
     
     # Amount validation
     if amount and amount > 0:
-        evidence_result["amount"] = amount
-        evidence_result["amount_category"] = (
+        evidence_result.amount = amount
+        evidence_result.amount_category = (
             "low" if amount < 10000 else
             "medium" if amount < 100000 else
             "high" if amount < 1000000 else
@@ -145,10 +151,9 @@ async def evidence_collector(state: dict) -> dict:
         )
         score += 10
     
-    evidence_result["evidence_score"] = min(score, 100)
+    evidence_result.evidence_score = min(score, 100)
     
     return {
-        **state,
         "bank_name": bank_name,
         "evidence": evidence_result,
         "current_node": "evidence",
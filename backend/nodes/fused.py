@@ -0,0 +1,122 @@
+"""
+Fused Node: Triage + Report
+Classifies the scam and writes the NCRP report in a single LLM call
+(workflow mode "fused"). Runs alongside the deterministic evidence and
+router stages; router prioritization is applied afterwards in finalize.
+"""
+
+from data.scam_types import normalize_scam_type
+from nodes.triage import triage_auditor, keyword_triage
+from nodes.evidence import evidence_collector
+from nodes.router import nodal_router, apply_urgency
+from nodes.reporter import portal_reporter, report_fields, build_report, build_fallback_report
+from services.llm import invoke_json_with_usage, CircuitOpenError
+from services.compaction import compact_for_prompt, REPORT_TOKEN_BUDGET
+
+FUSED_PROMPT = """You are an expert cyber crime analyst and complaint writer for Maharashtra Cyber Police.
+First classify the fraud complaint into one of these categories, then write a formal complaint report for it.
+
+SCAM CATEGORIES:
+1. digital_arrest - Impersonation of police/CBI/customs, fake arrest threats
+2. investment_scam - Fake trading apps, crypto schemes, guaranteed returns
+3. upi_fraud - Fake payment requests, QR code scams, UPI PIN theft
+4. loan_app_fraud - Illegal loan apps, harassment, blackmail
+5. otp_fraud - Social engineering for OTP/bank credentials
+6. job_fraud - Fake job offers, work-from-home task scams
+7. sextortion - Blackmail with intimate content, romance scams
+8. tech_support - Fake tech support, remote access scams
+9. courier_scam - Fake courier/customs holding package
+10. other - Other cyber fraud
+
+The report MUST be at least 200 characters (mandatory for NCRP portal).
+
+CASE DETAILS:
+- Description: {complaint}
+- Amount Lost: Rs.{amount}
+- Transaction Reference (UTR): {utr}
+- Bank Involved: {bank_name}
+- Suspect Phone: {suspect_phone}
+- Suspect URL/App: {suspect_url}
+- Date of Incident: {incident_date}
+
+Respond ONLY with valid JSON (no markdown, no code blocks) with these fields:
+{{"scam_type": "category_id from above", "confidence": 0.0-1.0, "reasoning": "brief explanation", "urgency": "critical/high/medium/low", "key_indicators": ["indicator1", "indicator2"], "report_title": "Brief title for the complaint", "report_body": "Detailed complaint text (minimum 200 characters). Include all relevant details, timeline, and transaction information. Write formally.", "key_evidence": ["list", "of", "key", "evidence", "points"], "recommended_actions": ["action1", "action2"], "priority_level": "critical/high/medium/low"}}
+"""
+
+
+async def fused_triage_reporter(state: dict) -> dict:
+    """
+    Fused Node: Triage and report in one LLM call
+    Input: complaint and case details
+    Output: scam classification and report (state delta only)
+    """
+    # Degraded pipeline: the triage and report nodes handle the reduced modes
+    if state.get("pipeline_mode", "full") != "full":
+        delta = await triage_auditor(state)
+        delta.update(await portal_reporter({**state, **delta}))
+        delta.pop("workflow_complete", None)
+        return {**delta, "current_node": "fused"}
+
+    fields = report_fields(state)
+
+    try:
+        result, usage = await invoke_json_with_usage(FUSED_PROMPT, {
+            **fields,
+            "complaint": compact_for_prompt(fields["complaint"], REPORT_TOKEN_BUDGET)
+        }, temperature=0.2, node="fused", deadline=state.get("deadline"))
+
+        scam_type = normalize_scam_type(result.get("scam_type"))
+
+        return {
+            "scam_type": scam_type,
+            "scam_confidence": result.get("confidence", 0.5),
+            "scam_reasoning": result.get("reasoning", ""),
+            "urgency": result.get("urgency", "medium"),
+            "key_indicators": result.get("key_indicators", []),
+            "report": build_report({**fields, "scam_type": scam_type}, result),
+            "llm_usage": [usage],
+            "current_node": "fused",
+            "triage_complete": True,
+            "report_complete": True
+        }
+
+    except CircuitOpenError as e:
+        triage = keyword_triage(fields["complaint"])
+        return {
+            **triage,
+            "error": f"Fused triage/report error: {str(e)}",
+            "report": build_fallback_report({**fields, "scam_type": triage["scam_type"]}, str(e)),
+            "current_node": "fused",
+            "report_complete": True
+        }
+
+    except Exception as e:
+        print(f"Fused triage/report error: {e}")
+        return {
+            "scam_type": "other",
+            "scam_confidence": 0.3,
+            "urgency": "medium",
+            "error": f"Fused triage/report error: {str(e)}",
+            "report": build_fallback_report(fields, str(e)),
+            "current_node": "fused",
+            "triage_complete": True,
+            "report_complete": True
+        }
+
+
+async def deterministic_stages(state: dict) -> dict:
+    """Evidence collection followed by routing, without waiting for triage"""
+    delta = await evidence_collector(state)
+    delta.update(await nodal_router({**state, **delta}))
+    return delta
+
+
+async def finalize(state: dict) -> dict:
+    """Apply the triage urgency to the routing computed without it"""
+    routing = state.get("routing")
+
+    return {
+        "routing": apply_urgency(routing, state.get("urgency", "medium")) if routing else routing,
+        "current_node": "finalize",
+        "workflow_complete": True
+    }
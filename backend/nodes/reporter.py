@@ -3,19 +3,10 @@ Node 4: Portal Reporter
 Uses LLM to generate formatted report for Maha-Cyber Portal
 """
 
-import os
 from datetime import datetime
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-
-
-def get_llm():
-    return ChatGoogleGenerativeAI(
-        model="gemini-1.5-flash",
-        google_api_key=os.getenv("GOOGLE_API_KEY"),
-        temperature=0.3
-    )
+from nodes.results import EvidenceResult, ReportResult
+from services.llm import invoke_json_with_usage
+from services.compaction import compact_for_prompt, REPORT_TOKEN_BUDGET
 
 
 REPORT_PROMPT = """You are an expert complaint writer for Maharashtra Cyber Police.
@@ -41,7 +32,7 @@ Generate the report in valid JSON format (no markdown, no code blocks):
 
 EMAIL_TEMPLATE = """Subject: URGENT: Cyber Fraud Report - {scam_type} - Rs.{amount}
 
-Dear Nodal Officer,
+Dear {salutation},
 
 I am reporting a cyber fraud incident that occurred on {incident_date}.
 
@@ -64,76 +55,129 @@ Contact: {victim_phone}
 """
 
 
+def report_fields(state: dict) -> dict:
+    """Extract the case details used by the report prompt and templates"""
+    evidence = state.get("evidence")
+    
+    return {
+        "complaint": state.get("complaint", ""),
+        "scam_type": state.get("scam_type", "other"),
+        "amount": state.get("amount", 0),
+        "utr": state.get("utr", "N/A"),
+        "bank_name": state.get("bank_name", "Unknown"),
+        "suspect_phone": state.get("suspect_phone", "N/A"),
+        "suspect_url": state.get("suspect_url", "N/A"),
+        "incident_date": state.get("incident_date", datetime.now().strftime("%Y-%m-%d")),
+        "victim_name": state.get("victim_name", "Complainant"),
+        "victim_phone": state.get("victim_phone", "N/A"),
+        "evidence_score": evidence.evidence_score if isinstance(evidence, EvidenceResult) else 50
+    }
+
+
+def render_email_draft(fields: dict, report_body: str, officer: dict = None) -> str:
+    """Fill the nodal officer email template, personalized when an officer is given"""
+    salutation = "Nodal Officer"
+    if officer:
+        salutation = f"{officer['officer_name']} ({officer['region']}), {officer['bank_name']}"
+    
+    return EMAIL_TEMPLATE.format(
+        salutation=salutation,
+        scam_type=fields["scam_type"].replace("_", " ").title(),
+        amount=fields["amount"],
+        incident_date=fields["incident_date"],
+        report_body=report_body,
+        utr=fields["utr"],
+        bank_name=fields["bank_name"],
+        suspect_phone=fields["suspect_phone"],
+        suspect_url=fields["suspect_url"],
+        victim_name=fields["victim_name"],
+        victim_phone=fields["victim_phone"]
+    )
+
+
+def build_report(fields: dict, result: dict) -> ReportResult:
+    """Assemble the report from the LLM's JSON reply"""
+    scam_type = fields["scam_type"]
+    report_body = result.get("report_body", fields["complaint"])
+    
+    return ReportResult(
+        title=result.get("report_title", f"Cyber Fraud Report - {scam_type}"),
+        body=report_body,
+        body_length=len(report_body),
+        meets_minimum=len(report_body) >= 200,
+        key_evidence=result.get("key_evidence", []),
+        recommended_actions=result.get("recommended_actions", []),
+        priority_level=result.get("priority_level", "medium"),
+        email_draft=render_email_draft(fields, report_body),
+        generated_at=datetime.now().isoformat()
+    )
+
+
+def build_fallback_report(fields: dict, error: str) -> ReportResult:
+    """Generate a basic report without the LLM"""
+    scam_type = fields["scam_type"]
+    basic_report = f"""
+Cyber Fraud Complaint Report
+
+Type: {scam_type.replace("_", " ").title()}
+Date: {fields["incident_date"]}
+Amount Lost: Rs.{fields["amount"]}
+
+Incident Description:
+{fields["complaint"]}
+
+Transaction Details:
+- UTR/Reference Number: {fields["utr"]}
+- Bank: {fields["bank_name"]}
+
+Suspect Information:
+- Phone Number: {fields["suspect_phone"]}
+- Website/App: {fields["suspect_url"]}
+
+This complaint is being filed for immediate action under the Cyber Golden Hour protocol.
+    """.strip()
+    
+    return ReportResult(
+        title=f"Cyber Fraud Report - {scam_type}",
+        body=basic_report,
+        body_length=len(basic_report),
+        meets_minimum=len(basic_report) >= 200,
+        key_evidence=[fields["utr"], fields["suspect_phone"], fields["suspect_url"]],
+        recommended_actions=["File FIR", "Contact bank nodal officer", "Report on NCRP"],
+        priority_level="medium",
+        email_draft=basic_report,
+        generated_at=datetime.now().isoformat(),
+        llm_error=error
+    )
+
+
 async def portal_reporter(state: dict) -> dict:
     """
     Node 4: Generate formatted report for Maha-Cyber Portal
     Input: all collected data from previous nodes
-    Output: formatted report ready for submission
+    Output: formatted report ready for submission (state delta only)
     """
     
-    # Extract data from state
-    complaint = state.get("complaint", "")
-    scam_type = state.get("scam_type", "other")
-    amount = state.get("amount", 0)
-    utr = state.get("utr", "N/A")
-    bank_name = state.get("bank_name", "Unknown")
-    suspect_phone = state.get("suspect_phone", "N/A")
-    suspect_url = state.get("suspect_url", "N/A")
-    incident_date = state.get("incident_date", datetime.now().strftime("%Y-%m-%d"))
-    evidence = state.get("evidence", {})
-    victim_name = state.get("victim_name", "Complainant")
-    victim_phone = state.get("victim_phone", "N/A")
+    fields = report_fields(state)
     
-    evidence_score = evidence.get("evidence_score", 50) if isinstance(evidence, dict) else 50
+    # Degraded pipeline: template report without the LLM
+    if state.get("pipeline_mode") == "deterministic":
+        return {
+            "report": build_fallback_report(fields, "LLM report skipped (deterministic mode)"),
+            "current_node": "reporter",
+            "report_complete": True,
+            "workflow_complete": True
+        }
     
     try:
-        llm = get_llm()
-        prompt = ChatPromptTemplate.from_template(REPORT_PROMPT)
-        parser = JsonOutputParser()
-        
-        chain = prompt | llm | parser
-        
-        result = await chain.ainvoke({
-            "scam_type": scam_type,
-            "complaint": complaint,
-            "amount": amount,
-            "utr": utr,
-            "bank_name": bank_name,
-            "suspect_phone": suspect_phone,
-            "suspect_url": suspect_url,
-            "incident_date": incident_date,
-            "evidence_score": evidence_score
-        })
-        
-        report_body = result.get("report_body", complaint)
-        
-        # Generate email draft
-        email_draft = EMAIL_TEMPLATE.format(
-            scam_type=scam_type.replace("_", " ").title(),
-            amount=amount,
-            incident_date=incident_date,
-            report_body=report_body,
-            utr=utr,
-            bank_name=bank_name,
-            suspect_phone=suspect_phone,
-            suspect_url=suspect_url,
-            victim_name=victim_name,
-            victim_phone=victim_phone
-        )
+        result, usage = await invoke_json_with_usage(REPORT_PROMPT, {
+            **fields,
+            "complaint": compact_for_prompt(fields["complaint"], REPORT_TOKEN_BUDGET)
+        }, temperature=0.3, node="reporter", deadline=state.get("deadline"))
         
         return {
-            **state,
-            "report": {
-                "title": result.get("report_title", f"Cyber Fraud Report - {scam_type}"),
-                "body": report_body,
-                "body_length": len(report_body),
-                "meets_minimum": len(report_body) >= 200,
-                "key_evidence": result.get("key_evidence", []),
-                "recommended_actions": result.get("recommended_actions", []),
-                "priority_level": result.get("priority_level", "medium"),
-                "email_draft": email_draft,
-                "generated_at": datetime.now().isoformat()
-            },
+            "report": build_report(fields, result),
+            "llm_usage": [usage],
             "current_node": "reporter",
             "report_complete": True,
             "workflow_complete": True
@@ -141,42 +185,9 @@ async def portal_reporter(state: dict) -> dict:
         
     except Exception as e:
         print(f"Reporter error: {e}")
-        # Fallback: Generate basic report without LLM
-        basic_report = f"""
-Cyber Fraud Complaint Report
-
-Type: {scam_type.replace("_", " ").title()}
-Date: {incident_date}
-Amount Lost: Rs.{amount}
-
-Incident Description:
-{complaint}
-
-Transaction Details:
-- UTR/Reference Number: {utr}
-- Bank: {bank_name}
-
-Suspect Information:
-- Phone Number: {suspect_phone}
-- Website/App: {suspect_url}
-
-This complaint is being filed for immediate action under the Cyber Golden Hour protocol.
-        """.strip()
-        
         return {
-            **state,
-            "report": {
-                "title": f"Cyber Fraud Report - {scam_type}",
-                "body": basic_report,
-                "body_length": len(basic_report),
-                "meets_minimum": len(basic_report) >= 200,
-                "key_evidence": [utr, suspect_phone, suspect_url],
-                "recommended_actions": ["File FIR", "Contact bank nodal officer", "Report on NCRP"],
-                "priority_level": "medium",
-                "email_draft": basic_report,
-                "generated_at": datetime.now().isoformat(),
-                "llm_error": str(e)
-            },
+            # Fallback: Generate basic report without LLM
+            "report": build_fallback_report(fields, str(e)),
             "current_node": "reporter",
             "report_complete": True,
             "workflow_complete": True
@@ -0,0 +1,80 @@
+"""
+Node Result Payloads
+Compact slotted containers for the nested evidence, routing and report outputs.
+They stay as objects inside the workflow state and are only turned into
+JSON-ready dicts at the API edge via to_dict().
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, List, Optional
+
+
+class _Payload:
+    """Shared serialization for node result dataclasses"""
+    __slots__ = ()
+
+    # Fields dropped from to_dict() while unset, matching the original dict shape
+    OPTIONAL_FIELDS: ClassVar[tuple] = ()
+
+    def to_dict(self) -> dict:
+        payload = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is None and f.name in self.OPTIONAL_FIELDS:
+                continue
+            payload[f.name] = value
+        return payload
+
+
+@dataclass(slots=True)
+class EvidenceResult(_Payload):
+    """Output of Node 2: Evidence Collector"""
+    utr_validated: bool = False
+    utr_info: dict = field(default_factory=dict)
+    bank_identified: Optional[str] = None
+    suspect_checks: List[dict] = field(default_factory=list)
+    evidence_score: int = 0
+    entities: List[dict] = field(default_factory=list)
+    bank_name: Optional[str] = None
+    amount: Optional[float] = None
+    amount_category: Optional[str] = None
+
+    OPTIONAL_FIELDS: ClassVar[tuple] = ("bank_name", "amount", "amount_category")
+
+
+@dataclass(slots=True)
+class RoutingResult(_Payload):
+    """Output of Node 3: Nodal Router"""
+    nodal_officers: List[dict] = field(default_factory=list)
+    routing_success: bool = False
+    routing_message: str = ""
+    fallback_contacts: Optional[List[dict]] = None
+    emergency_action: Optional[dict] = None
+
+    OPTIONAL_FIELDS: ClassVar[tuple] = ("fallback_contacts", "emergency_action")
+
+
+@dataclass(slots=True)
+class ReportResult(_Payload):
+    """Output of Node 4: Portal Reporter"""
+    title: str
+    body: str
+    body_length: int
+    meets_minimum: bool
+    key_evidence: List[str]
+    recommended_actions: List[str]
+    priority_level: str
+    email_draft: str
+    generated_at: str
+    llm_error: Optional[str] = None
+
+    OPTIONAL_FIELDS: ClassVar[tuple] = ("llm_error",)
+
+
+def to_payload(value) -> dict:
+    """Serialize a node result (or legacy dict) for an API response"""
+    if value is None:
+        return {}
+    if isinstance(value, _Payload):
+        return value.to_dict()
+    return value
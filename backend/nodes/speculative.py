@@ -0,0 +1,69 @@
+"""
+Speculative Node: Triage with overlapped report generation
+Predicts the scam type from SCAM_TYPES keywords and starts the report LLM
+call while the LLM triage is still running (workflow mode "speculative").
+The speculative report is kept when triage agrees, otherwise it is
+cancelled and re-issued with the triaged scam type.
+"""
+
+import asyncio
+import time
+
+from data.scam_types import predict_scam_type
+from nodes.triage import triage_auditor
+from nodes.reporter import portal_reporter
+from services import metrics
+
+
+async def _timed(coro) -> tuple:
+    started = time.perf_counter()
+    result = await coro
+    return result, (time.perf_counter() - started) * 1000
+
+
+async def speculative_triage_reporter(state: dict) -> dict:
+    """
+    Speculative Node: Run triage and a predicted-type report concurrently
+    Input: complaint, evidence and case details
+    Output: triage and report fields plus speculation stats (state delta only)
+    """
+    predicted = predict_scam_type(state.get("complaint", ""))["scam_type"]
+    started = time.perf_counter()
+
+    report_task = asyncio.create_task(
+        _timed(portal_reporter({**state, "scam_type": predicted}))
+    )
+    try:
+        triage_delta, triage_ms = await _timed(triage_auditor(state))
+    except BaseException:
+        report_task.cancel()
+        raise
+
+    hit = triage_delta.get("scam_type", "other") == predicted
+    if hit:
+        report_delta, report_ms = await report_task
+        # Sequential execution would have paid for both calls back to back
+        saved_ms = max(0.0, triage_ms + report_ms - (time.perf_counter() - started) * 1000)
+        metrics.increment("speculative.hits")
+        metrics.increment("speculative.saved_ms", saved_ms)
+    else:
+        report_task.cancel()
+        try:
+            await report_task
+        except asyncio.CancelledError:
+            pass
+        report_delta, report_ms = await _timed(portal_reporter({**state, **triage_delta}))
+        saved_ms = 0.0
+        metrics.increment("speculative.misses")
+
+    return {
+        **triage_delta,
+        **report_delta,
+        "llm_usage": triage_delta.get("llm_usage", []) + report_delta.get("llm_usage", []),
+        "speculation": {
+            "predicted_scam_type": predicted,
+            "hit": hit,
+            "saved_ms": round(saved_ms, 1)
+        },
+        "current_node": "speculative"
+    }
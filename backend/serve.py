@@ -0,0 +1,204 @@
+"""
+Cyber-Suraksha Pre-fork Server
+Loads the API, reference data, lookup indexes and the LangGraph workflow once
+in a supervising master, freezes the heap with gc.freeze() and forks uvicorn
+workers that share those pages copy-on-write.
+
+Usage (from backend/):
+    python serve.py --workers 8 --port 8000
+"""
+
+import argparse
+import gc
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+
+def memory_usage_kb(pid: str = "self") -> dict:
+    """RSS / PSS / shared / private memory for a process (Linux smaps_rollup)"""
+    usage = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    usage[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        import resource
+        return {"rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+
+    return {
+        "rss_kb": usage.get("Rss", 0),
+        "pss_kb": usage.get("Pss", 0),
+        "shared_kb": usage.get("Shared_Clean", 0) + usage.get("Shared_Dirty", 0),
+        "private_kb": usage.get("Private_Clean", 0) + usage.get("Private_Dirty", 0)
+    }
+
+
+def preload(load_workflow: bool):
+    """Import and index everything workers need before forking"""
+    started = time.perf_counter()
+
+    import main  # noqa: F401  (FastAPI app, data modules and their indexes)
+    from services.warmup import load_workflow as compile_workflow, mark_ready
+
+    if load_workflow:
+        compile_workflow()
+        mark_ready()
+
+    # Move everything allocated so far out of GC tracking so collections in
+    # the workers do not touch (and un-share) these pages
+    gc.collect()
+    gc.freeze()
+
+    return (time.perf_counter() - started) * 1000
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(worker_id: int, sock: socket.socket, report_fd: int, args, forked_at: float):
+    """Child process: serve the shared socket with a single uvicorn server"""
+    import uvicorn
+    from main import app
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    class ReportingServer(uvicorn.Server):
+        async def startup(self, sockets=None):
+            await super().startup(sockets=sockets)
+            report = {
+                "worker": worker_id,
+                "pid": os.getpid(),
+                "startup_ms": round((time.perf_counter() - forked_at) * 1000, 1),
+                **memory_usage_kb()
+            }
+            os.write(report_fd, (json.dumps(report) + "\n").encode())
+
+    config = uvicorn.Config(app, log_level=args.log_level, lifespan="on")
+    ReportingServer(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """Master process: forks workers, restarts crashed ones and prints reports"""
+
+    def __init__(self, args, sock: socket.socket):
+        self.args = args
+        self.sock = sock
+        self.workers = {}
+        self.reports = {}
+        self.stopping = False
+        self.report_read, self.report_write = os.pipe()
+
+    def spawn(self, worker_id: int):
+        forked_at = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(self.report_read)
+            try:
+                run_worker(worker_id, self.sock, self.report_write, self.args, forked_at)
+            finally:
+                os._exit(0)
+        self.workers[pid] = worker_id
+
+    def stop(self, signum, frame):
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def print_report(self):
+        print(f"{'worker':>6} {'pid':>8} {'startup ms':>11} {'rss MB':>8} {'pss MB':>8} {'shared MB':>10} {'private MB':>11}")
+        for worker_id in sorted(self.reports):
+            r = self.reports[worker_id]
+            print(
+                f"{r['worker']:>6} {r['pid']:>8} {r['startup_ms']:>11} "
+                f"{r.get('rss_kb', 0) / 1024:>8.1f} {r.get('pss_kb', 0) / 1024:>8.1f} "
+                f"{r.get('shared_kb', 0) / 1024:>10.1f} {r.get('private_kb', 0) / 1024:>11.1f}"
+            )
+        total_pss = sum(r.get("pss_kb", 0) for r in self.reports.values()) / 1024
+        print(f"total worker PSS: {total_pss:.1f} MB across {len(self.reports)} workers")
+        sys.stdout.flush()
+
+    def read_reports(self, timeout: float):
+        ready, _, _ = select.select([self.report_read], [], [], timeout)
+        if not ready:
+            return
+        for line in os.read(self.report_read, 65536).decode().splitlines():
+            report = json.loads(line)
+            self.reports[report["worker"]] = report
+            if len(self.reports) >= self.args.workers:
+                self.print_report()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for worker_id in range(self.args.workers):
+            self.spawn(worker_id)
+
+        while self.workers:
+            self.read_reports(timeout=1.0)
+
+            while True:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    pid = 0
+                if pid == 0:
+                    break
+
+                worker_id = self.workers.pop(pid, None)
+                if worker_id is None:
+                    continue
+                self.reports.pop(worker_id, None)
+                if not self.stopping:
+                    print(f"Worker {worker_id} (pid {pid}) exited with status {status}, restarting")
+                    self.spawn(worker_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cyber-Suraksha pre-fork server")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument(
+        "--no-preload-workflow", action="store_true",
+        help="Do not compile the LangGraph workflow in the master"
+    )
+    args = parser.parse_args()
+
+    # Workers inherit a loaded workflow; skip their own background warm-up
+    if not args.no_preload_workflow:
+        os.environ["WARMUP_ON_STARTUP"] = "false"
+
+    preload_ms = preload(load_workflow=not args.no_preload_workflow)
+    master_memory = memory_usage_kb()
+    print(
+        f"Master {os.getpid()}: preloaded in {preload_ms:.0f} ms, "
+        f"rss {master_memory['rss_kb'] / 1024:.1f} MB, "
+        f"{gc.get_freeze_count()} objects frozen"
+    )
+
+    sock = bind_socket(args.host, args.port)
+    print(f"Serving on {args.host}:{args.port} with {args.workers} workers")
+    Supervisor(args, sock).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+LLM Circuit Breaker
+Stops calling Gemini while it is failing. Closed: calls flow and outcomes are
+recorded. Open: calls fail immediately with CircuitOpenError so nodes go
+straight to their deterministic fallbacks. Half-open: after the cool-down a
+single probe call is let through; its outcome closes or re-opens the circuit.
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from services import metrics
+
+STATES = ("closed", "open", "half_open")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making an LLM call while the circuit is open"""
+
+
+class CircuitBreaker:
+    """Failure-rate breaker over the last `window` calls"""
+
+    def __init__(self, failure_rate_threshold: float = 0.5, window: int = 20,
+                 min_calls: int = 5, open_seconds: float = 30):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.state = "closed"
+        self.opened_at = None
+        self.last_error = None
+        self.transitions = deque(maxlen=20)
+        self._outcomes = deque(maxlen=window)
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        metrics.set_gauge("llm.breaker.state", self.state)
+
+    def _transition(self, state: str, reason: str):
+        self.transitions.append({"from": self.state, "to": state, "reason": reason, "at": datetime.now().isoformat()})
+        self.state = state
+        metrics.set_gauge("llm.breaker.state", state)
+        metrics.increment(f"llm.breaker.{state}")
+        print(f"LLM circuit {self.transitions[-1]['from']} -> {state}: {reason}")
+
+    def _open(self, reason: str):
+        self.opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._transition("open", reason)
+
+    def before_call(self):
+        """Admit a call or raise CircuitOpenError"""
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.open_seconds:
+                self._transition("half_open", "cool-down elapsed")
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+
+            metrics.increment("llm.breaker.short_circuits")
+            detail = f" (last error: {self.last_error})" if self.last_error else ""
+            raise CircuitOpenError(f"LLM circuit {self.state}{detail}")
+
+    def record_success(self):
+        with self._lock:
+            if self.state == "half_open":
+                self._probe_in_flight = False
+                self._outcomes.clear()
+                self._transition("closed", "probe succeeded")
+            self._outcomes.append(True)
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self.state == "half_open":
+                self._probe_in_flight = False
+                self._open(f"probe failed ({self.last_error})")
+                return
+
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (self.state == "closed" and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate_threshold):
+                self._open(f"{failures}/{len(self._outcomes)} recent calls failed ({self.last_error})")
+
+    def release(self):
+        """Give up a call without a verdict (e.g. the request was cancelled)"""
+        with self._lock:
+            if self.state == "half_open":
+                self._probe_in_flight = False
+
+    def status(self) -> dict:
+        with self._lock:
+            outcomes = len(self._outcomes)
+            retry_in = None
+            if self.state == "open":
+                retry_in = round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 1)
+            return {
+                "state": self.state,
+                "failure_rate": self._outcomes.count(False) / outcomes if outcomes else 0.0,
+                "recent_calls": outcomes,
+                "probe_in_s": retry_in,
+                "last_error": self.last_error,
+                "recent_transitions": list(self.transitions)[-5:]
+            }
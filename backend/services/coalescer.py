@@ -0,0 +1,109 @@
+"""
+Request Coalescer
+Single-flight execution and replay window for duplicate workflow submissions
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+
+class IdempotencyKeyConflict(Exception):
+    """An idempotency key was reused with a different payload"""
+
+
+def payload_key(payload: dict) -> str:
+    """Hash a request payload after normalizing whitespace and casing"""
+    normalized = {}
+    for field, value in payload.items():
+        if isinstance(value, str):
+            value = " ".join(value.split()).lower() or None
+        normalized[field] = value
+
+    encoded = json.dumps(normalized, sort_keys=True, default=str)
+    return "payload:" + hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RequestCoalescer:
+    """
+    Shares one in-flight execution between concurrent callers with the same key
+    and replays completed results for a TTL window.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._inflight: dict = {}
+        self._completed: OrderedDict = OrderedDict()
+
+    def _get_completed(self, key: str) -> Optional[tuple]:
+        entry = self._completed.get(key)
+        if entry is None:
+            return None
+
+        expires_at, result, fingerprint = entry
+        if expires_at < time.monotonic():
+            del self._completed[key]
+            return None
+
+        self._completed.move_to_end(key)
+        return result, fingerprint
+
+    def _store_completed(self, key: str, result: dict, fingerprint: Optional[str]):
+        self._completed[key] = (time.monotonic() + self.ttl_seconds, result, fingerprint)
+        self._completed.move_to_end(key)
+        while len(self._completed) > self.max_entries:
+            self._completed.popitem(last=False)
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[dict]],
+                  fingerprint: Optional[str] = None) -> tuple:
+        """
+        Execute factory once per key
+
+        Args:
+            key: Coalescing key
+            factory: Starts the run
+            fingerprint: Payload hash bound to the key; a caller presenting the
+                same key with a different fingerprint is rejected
+
+        Returns:
+            (result, status) where status is "miss", "joined" or "replayed"
+
+        Raises:
+            IdempotencyKeyConflict: key is in use for a different payload
+        """
+        completed = self._get_completed(key)
+        if completed is not None:
+            result, bound = completed
+            if bound != fingerprint:
+                raise IdempotencyKeyConflict(key)
+            return result, "replayed"
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            task, bound = inflight
+            if bound != fingerprint:
+                raise IdempotencyKeyConflict(key)
+            # Shield so a disconnecting follower does not cancel the shared run
+            return await asyncio.shield(task), "joined"
+
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = (task, fingerprint)
+
+        def _on_done(done: asyncio.Task):
+            self._inflight.pop(key, None)
+            if not done.cancelled() and done.exception() is None:
+                self._store_completed(key, done.result(), fingerprint)
+
+        task.add_done_callback(_on_done)
+        return await asyncio.shield(task), "miss"
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._inflight),
+            "replayable": len(self._completed),
+            "ttl_seconds": self.ttl_seconds
+        }
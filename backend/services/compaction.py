@@ -0,0 +1,135 @@
+"""
+Prompt Compaction
+Fits long complaints (often pasted WhatsApp chat logs) into a token budget
+before they are inlined into LLM prompts. The original complaint is never
+modified; only the text sent to the model is compacted.
+"""
+
+import hashlib
+import math
+import os
+import re
+from collections import OrderedDict
+
+from data.scam_types import SCAM_TYPES
+
+TRIAGE_TOKEN_BUDGET = int(os.getenv("TRIAGE_PROMPT_TOKEN_BUDGET", "800"))
+REPORT_TOKEN_BUDGET = int(os.getenv("REPORT_PROMPT_TOKEN_BUDGET", "1200"))
+
+# Compacted text keyed by a digest of the complaint, so a 100k-char complaint
+# costs 32 bytes of key and at most one budget's worth of value
+COMPACTION_CACHE_SIZE = 32
+_compaction_cache = OrderedDict()
+
+# Gemini tokenizes English/Hinglish text at roughly 4 characters per token
+CHARS_PER_TOKEN = 4
+
+# "[12/03/24, 10:15 AM] " or "12/03/2024, 10:15 pm - " chat export prefixes
+_CHAT_PREFIX = re.compile(
+    r"^\s*\[?\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4},?\s+\d{1,2}:\d{2}(?::\d{2})?\s*(?:[ap]\.?m\.?)?\]?\s*-?\s*",
+    re.IGNORECASE
+)
+
+_BOILERPLATE = re.compile(
+    r"<media omitted>|<attached:[^>]*>|this message was deleted|you deleted this message|"
+    r"messages and calls are end-to-end encrypted|missed (?:voice|video) call|"
+    r"^(?:[^:]{1,40}:\s*)?(?:ok|okay|hmm+|yes|no|hi|hello|k)\.?$",
+    re.IGNORECASE
+)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+_SCAM_KEYWORDS = tuple(sorted({kw for scam in SCAM_TYPES for kw in scam["keywords"]}))
+
+_INDICATOR_PATTERNS = (
+    re.compile(r"(?:rs\.?|inr|₹)\s*[\d,]+|\b\d[\d,]{3,}\b", re.IGNORECASE),  # amounts / references
+    re.compile(r"(?:\+91|\b0)?[6-9]\d{9}\b"),                                   # phone numbers
+    re.compile(r"https?://\S+|\bwww\.\S+|\b[\w-]+\.(?:com|in|net|org|app|xyz)\b", re.IGNORECASE),
+    re.compile(r"\b[\w.-]+@[a-z]{2,}\b", re.IGNORECASE),                         # UPI handles
+    re.compile(r"\b(?:otp|pin|cvv|password|anydesk|teamviewer|screen share)\b", re.IGNORECASE),
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def clean_lines(text: str) -> list:
+    """Strip chat timestamps, boilerplate and duplicate lines"""
+    lines = []
+    seen = set()
+    for raw in text.splitlines():
+        line = _CHAT_PREFIX.sub("", raw).strip()
+        if not line or _BOILERPLATE.search(line):
+            continue
+        key = " ".join(line.lower().split())
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def indicator_score(sentence: str) -> int:
+    """Count scam indicators (keywords, amounts, identifiers) in a sentence"""
+    lowered = sentence.lower()
+    score = sum(1 for kw in _SCAM_KEYWORDS if kw in lowered)
+    score += sum(2 for pattern in _INDICATOR_PATTERNS if pattern.search(sentence))
+    return score
+
+
+def compact_for_prompt(text: str, token_budget: int) -> str:
+    """
+    Fit a complaint into a prompt token budget
+
+    Args:
+        text: Original complaint text
+        token_budget: Maximum estimated tokens for the complaint section
+
+    Returns:
+        The text unchanged if it fits, otherwise the cleaned text reduced to
+        the highest-signal sentences in their original order
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    # Triage and report (and duplicate submissions) compact the same complaint
+    key = (hashlib.sha256(text.encode("utf-8")).digest(), token_budget)
+    compacted = _compaction_cache.get(key)
+    if compacted is not None:
+        _compaction_cache.move_to_end(key)
+        return compacted
+
+    compacted = _compact(text, token_budget)
+    _compaction_cache[key] = compacted
+    while len(_compaction_cache) > COMPACTION_CACHE_SIZE:
+        _compaction_cache.popitem(last=False)
+    return compacted
+
+
+def _compact(text: str, token_budget: int) -> str:
+    """Cleaned, sentence-ranked compaction of a complaint over budget"""
+    lines = clean_lines(text)
+    cleaned = "\n".join(lines)
+    if estimate_tokens(cleaned) <= token_budget:
+        return cleaned
+
+    sentences = [s for line in lines for s in _SENTENCE_SPLIT.split(line) if s]
+    if not sentences:
+        return cleaned[:token_budget * CHARS_PER_TOKEN]
+
+    # Always keep the opening sentence for context, then the most indicative ones
+    ranked = sorted(range(1, len(sentences)), key=lambda i: (-indicator_score(sentences[i]), i))
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    selected = {0}
+    used = len(sentences[0]) + 1
+    for i in ranked:
+        cost = len(sentences[i]) + 1
+        if used + cost > budget_chars:
+            continue
+        selected.add(i)
+        used += cost
+
+    compacted = "\n".join(sentences[i] for i in sorted(selected))
+    return compacted[:budget_chars]
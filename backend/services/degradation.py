@@ -0,0 +1,150 @@
+"""
+Adaptive Degradation Controller
+Watches rolling LLM latency and error rates per node and steps the pipeline
+down as latency-SLO headroom shrinks:
+
+    full            - LLM triage + LLM report
+    keyword_triage  - keyword triage (SCAM_TYPES) + LLM report
+    deterministic   - keyword triage + template report, no LLM calls
+
+It steps back up one level at a time once the recovery period has passed
+and the remaining observations are healthy.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from services import metrics
+
+MODES = ("full", "keyword_triage", "deterministic")
+
+# The fused triage+report call is judged against the report budget
+_NODE_ALIASES = {"fused": "reporter"}
+
+
+def _p95(values: list) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class DegradationController:
+    """Chooses the pipeline mode for each new request"""
+
+    def __init__(self, slo_ms: float = 10000, degrade_headroom: float = 0.1,
+                 window_seconds: float = 60, min_samples: int = 5,
+                 max_error_rate: float = 0.5, recovery_seconds: float = 30):
+        self.slo_ms = slo_ms
+        self.degrade_headroom = degrade_headroom
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.recovery_seconds = recovery_seconds
+        self.mode = "full"
+        self.changed_at = time.monotonic()
+        self.transitions = deque(maxlen=50)
+        self._samples = {}
+        self._lock = threading.Lock()
+        metrics.set_gauge("degradation.mode", self.mode)
+
+    def observe(self, node: str, latency_ms: float, ok: bool):
+        """Record the outcome of one LLM call"""
+        node = _NODE_ALIASES.get(node, node)
+        with self._lock:
+            self._samples.setdefault(node, deque()).append((time.monotonic(), latency_ms, ok))
+
+    def _node_stats(self, node: str, now: float) -> dict:
+        samples = self._samples.get(node)
+        if samples is None:
+            return None
+        while samples and samples[0][0] < now - self.window_seconds:
+            samples.popleft()
+        if len(samples) < self.min_samples:
+            return None
+        return {
+            "p95_ms": _p95([latency for _, latency, _ in samples]),
+            "error_rate": sum(1 for _, _, ok in samples if not ok) / len(samples)
+        }
+
+    def _unhealthy(self, stats: dict, budget_ms: float) -> str:
+        """Reason a node breaches its share of the SLO, or None"""
+        if stats is None:
+            return None
+        if stats["error_rate"] > self.max_error_rate:
+            return f"error rate {stats['error_rate']:.0%}"
+        if stats["p95_ms"] > budget_ms * (1 - self.degrade_headroom):
+            return f"p95 {stats['p95_ms']:.0f}ms leaves <{self.degrade_headroom:.0%} headroom of {budget_ms:.0f}ms"
+        return None
+
+    def evaluate(self) -> tuple:
+        """
+        Pick the mode for a new request
+
+        Returns:
+            (mode, transition dict if the mode changed on this call, else None)
+        """
+        with self._lock:
+            now = time.monotonic()
+            triage = self._node_stats("triage", now)
+            reporter = self._node_stats("reporter", now)
+            reporter_budget = self.slo_ms - (triage["p95_ms"] if triage else 0)
+
+            index = MODES.index(self.mode)
+            reason = None
+            target = index
+
+            if self.mode == "full":
+                reason = self._unhealthy(triage, self.slo_ms / 2) or self._unhealthy(reporter, reporter_budget)
+                if reason:
+                    target = 1
+            if self.mode in ("full", "keyword_triage") and target < 2:
+                reporter_reason = self._unhealthy(reporter, self.slo_ms)
+                if reporter_reason:
+                    target, reason = 2, reporter_reason
+
+            if target == index and index > 0 and now - self.changed_at >= self.recovery_seconds:
+                # Only step up when no recent observation argues against it
+                if self._unhealthy(reporter, self.slo_ms) is None:
+                    target, reason = index - 1, "recovered"
+
+            transition = None
+            if target != index:
+                transition = {
+                    "from": self.mode,
+                    "to": MODES[target],
+                    "reason": reason,
+                    "at": datetime.now().isoformat()
+                }
+                self.mode = MODES[target]
+                self.changed_at = now
+                # Judge the new mode on fresh observations only
+                self._samples.clear()
+                self.transitions.append(transition)
+                metrics.increment("degradation.mode_changes")
+                metrics.increment(f"degradation.entered.{self.mode}")
+                metrics.set_gauge("degradation.mode", self.mode)
+                print(f"Pipeline mode {transition['from']} -> {transition['to']}: {reason}")
+
+            return self.mode, transition
+
+    def status(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "mode": self.mode,
+                "slo_ms": self.slo_ms,
+                "nodes": {node: self._node_stats(node, now) for node in list(self._samples)},
+                "recent_transitions": list(self.transitions)[-5:]
+            }
+
+
+controller = DegradationController(
+    slo_ms=float(os.getenv("ANALYZE_LATENCY_SLO_MS", "10000")),
+    degrade_headroom=float(os.getenv("DEGRADE_HEADROOM", "0.1")),
+    window_seconds=float(os.getenv("DEGRADE_WINDOW_SECONDS", "60")),
+    min_samples=int(os.getenv("DEGRADE_MIN_SAMPLES", "5")),
+    max_error_rate=float(os.getenv("DEGRADE_MAX_ERROR_RATE", "0.5")),
+    recovery_seconds=float(os.getenv("DEGRADE_RECOVERY_SECONDS", "30"))
+)
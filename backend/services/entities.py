@@ -0,0 +1,89 @@
+"""
+Complaint Entity Extractor
+Pulls phones, URLs, UPI handles, UTRs and rupee amounts out of free-text
+complaints in one pass of a single combined regex, with source spans.
+"""
+
+import re
+
+from data.canonical import PUBLIC_SUFFIXES, canonicalize
+
+_TLDS = "|".join(sorted((suffix for suffix in PUBLIC_SUFFIXES if "." not in suffix), key=len, reverse=True))
+_UNITS = {"k": 1e3, "thousand": 1e3, "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "crore": 1e7, "crores": 1e7, "cr": 1e7}
+_UNIT_PATTERN = "|".join(sorted(_UNITS, key=len, reverse=True))
+
+_LABEL = r"[a-z0-9-]{1,63}"
+_MAX_LABELS = 10
+_DOMAIN = rf"(?:{_LABEL}\.){{1,{_MAX_LABELS}}}"
+_NUMBER = r"\d[\d,]{0,20}"
+
+_UTR = r"(?:[a-z]{4}[0-9]{7,13}|[0-9]{12,16})"
+_UTR_KEYWORD = r"\b(?:utr|rrn|ref(?:erence)?|txn|transaction)\b(?:\s*(?:no|number|id))?\.?\s*[:#-]?\s*"
+
+# Alternation order matters: earlier groups win at the same position.
+# Emails are matched only so their domain part is not reported as a URL.
+# A digit run right after a UTR/ref keyword is a UTR even if it looks like a
+# +91 mobile number. Bare domains (no scheme or www.) must be lowercase unless
+# they carry a path, so "paid him.In the morning" is not a URL.
+# Every repetition is bounded (DNS label <= 63 chars, at most _MAX_LABELS
+# labels, email local part <= 64) so long dotted runs scan in linear time.
+_ENTITY_PATTERN = re.compile(
+    rf"(?P<email>\b[\w.+-]{{1,64}}@{_LABEL}(?:\.{_LABEL}){{1,{_MAX_LABELS}}}\b)"
+    rf"|(?P<amount>(?:₹|\brs\.?|\binr)\s?{_NUMBER}(?:\.\d{{1,2}})?(?:\s?(?:{_UNIT_PATTERN})\b)?"
+    rf"|\b{_NUMBER}(?:\.\d{{1,2}})?\s?(?:rupees|{_UNIT_PATTERN})\b)"
+    rf"|(?P<keyed_utr>{_UTR_KEYWORD}(?P<keyed_utr_value>{_UTR})\b)"
+    rf"|(?P<url>(?:\bhttps?://|\bwww\.)[^\s<>\"']+"
+    rf"|\b(?-i:{_DOMAIN}(?:{_TLDS}))\b(?:/[^\s<>\"']*)?"
+    rf"|\b{_DOMAIN}(?:{_TLDS})/[^\s<>\"']*)"
+    r"|(?P<upi>\b[a-z0-9._-]{2,64}@[a-z][a-z0-9]{1,63}\b(?!\.))"
+    r"|(?P<phone>(?<![\w+])(?:\+?91[\s-]?|0)?[6-9]\d{4}[\s-]?\d{5}(?!\d))"
+    rf"|(?P<utr>\b{_UTR}\b)",
+    re.IGNORECASE
+)
+
+
+def parse_amount(raw: str) -> float:
+    """Rupee value of an amount mention such as 'Rs. 2.5 lakh' or '₹50,000'"""
+    lowered = raw.lower()
+    number = re.search(r"\d[\d,]*(?:\.\d+)?", lowered).group().replace(",", "")
+    unit = re.search(rf"(?:{_UNIT_PATTERN})\s*$", lowered)
+    return float(number) * (_UNITS[unit.group().strip()] if unit else 1)
+
+
+def extract_entities(text: str) -> list:
+    """
+    Scan text once for identifiers
+
+    Returns:
+        List of {"type", "value", "canonical", "span": [start, end]} in text order;
+        canonical is the E.164 phone / host / VPA, uppercase UTR or rupee amount
+    """
+    entities = []
+    for match in _ENTITY_PATTERN.finditer(text or ""):
+        entity_type = match.lastgroup
+        if entity_type == "email":
+            continue
+        start = match.start()
+        if entity_type == "keyed_utr":
+            # Report the reference number itself, not the keyword before it
+            entity_type, start = "utr", match.start("keyed_utr_value")
+            value = match.group("keyed_utr_value")
+        else:
+            value = match.group().rstrip(".,);")
+
+        if entity_type == "amount":
+            canonical = parse_amount(value)
+        elif entity_type == "utr":
+            canonical = value.upper()
+        else:
+            canonical = canonicalize(entity_type, value)
+        if not canonical:
+            continue
+
+        entities.append({
+            "type": entity_type,
+            "value": value,
+            "canonical": canonical,
+            "span": [start, start + len(value)]
+        })
+    return entities
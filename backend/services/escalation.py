@@ -0,0 +1,181 @@
+"""
+Escalation Dispatcher
+Renders a personalized email for every nodal officer found by the router,
+queues them in the outbox and delivers them over a pool of reused async SMTP
+connections, batched per bank.
+
+For local testing run an SMTP stand-in, e.g.:
+    python -m aiosmtpd -n -l localhost:1025
+"""
+
+import asyncio
+import os
+from email.message import EmailMessage
+from itertools import groupby
+
+from nodes.reporter import report_fields, render_email_draft
+from services import metrics
+from services.outbox import Outbox
+
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "1025"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_FROM = os.getenv("SMTP_FROM", "alerts@cyber-suraksha.local")
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+
+
+def render_escalations(state: dict) -> list:
+    """Build one outbox message per routed nodal officer that has an email"""
+    routing = state.get("routing")
+    report = state.get("report")
+    if not routing or not report:
+        return []
+
+    fields = report_fields(state)
+    messages = []
+    for officer in routing.nodal_officers:
+        if not officer.get("email"):
+            continue
+        subject, _, body = render_email_draft(fields, report.body, officer).partition("\n")
+        messages.append({
+            "bank_name": officer["bank_name"],
+            "officer_id": officer.get("id"),
+            "recipient": officer["email"],
+            "subject": subject.replace("Subject:", "", 1).strip(),
+            "body": body.lstrip("\n")
+        })
+    return messages
+
+
+class SMTPPool:
+    """Bounded pool of authenticated aiosmtplib connections reused across sends"""
+
+    def __init__(self, size: int = SMTP_POOL_SIZE):
+        self.size = size
+        self._idle = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self):
+        try:
+            import aiosmtplib
+        except ImportError as e:
+            raise RuntimeError("aiosmtplib is required for escalation email delivery") from e
+
+        client = aiosmtplib.SMTP(
+            hostname=SMTP_HOST, port=SMTP_PORT, timeout=SMTP_TIMEOUT, start_tls=SMTP_STARTTLS
+        )
+        await client.connect()
+        if SMTP_USERNAME:
+            await client.login(SMTP_USERNAME, SMTP_PASSWORD or "")
+        metrics.increment("escalation.smtp_connects")
+        return client
+
+    async def acquire(self):
+        await self._slots.acquire()
+        try:
+            while not self._idle.empty():
+                client = self._idle.get_nowait()
+                if client.is_connected:
+                    return client
+            return await self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, client, healthy: bool = True):
+        if healthy and client.is_connected:
+            self._idle.put_nowait(client)
+        else:
+            client.close()
+        self._slots.release()
+
+    async def close(self):
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
+
+
+class EscalationDispatcher:
+    """Delivers due outbox messages, one pooled connection per bank batch"""
+
+    def __init__(self, outbox: Outbox, pool: SMTPPool = None, batch_limit: int = 500):
+        self.outbox = outbox
+        self.pool = pool or SMTPPool()
+        self.batch_limit = batch_limit
+        self._wakeup = asyncio.Event()
+
+    async def enqueue_case(self, state: dict) -> list:
+        """Queue escalation emails for a finished workflow and wake the sender"""
+        messages = render_escalations(state)
+        if not messages:
+            return []
+        # SQLite write (up to a 30s busy wait) runs off the event loop
+        ids = await asyncio.to_thread(self.outbox.enqueue, state.get("case_id", ""), messages)
+        metrics.increment("escalation.queued", len(ids))
+        self._wakeup.set()
+        return ids
+
+    async def _send_bank_batch(self, messages: list):
+        try:
+            client = await self.pool.acquire()
+        except Exception as e:
+            for message in messages:
+                self.outbox.mark_failed_attempt(message, f"connect: {e}")
+            metrics.increment("escalation.failed_attempts", len(messages))
+            return
+
+        healthy = True
+        sent = []
+        try:
+            for message in messages:
+                email = EmailMessage()
+                email["From"] = SMTP_FROM
+                email["To"] = message["recipient"]
+                email["Subject"] = message["subject"]
+                email.set_content(message["body"])
+                try:
+                    await client.send_message(email)
+                    sent.append(message["id"])
+                except Exception as e:
+                    self.outbox.mark_failed_attempt(message, str(e))
+                    metrics.increment("escalation.failed_attempts")
+                    if not client.is_connected:
+                        healthy = False
+                        for remaining in messages[messages.index(message) + 1:]:
+                            self.outbox.mark_failed_attempt(remaining, "connection lost")
+                        break
+        finally:
+            self.outbox.mark_sent(sent)
+            metrics.increment("escalation.sent", len(sent))
+            self.pool.release(client, healthy)
+
+    async def dispatch_due(self) -> int:
+        """Send every due message; returns how many were claimed"""
+        messages = self.outbox.claim_due(self.batch_limit)
+        if not messages:
+            return 0
+
+        messages.sort(key=lambda message: message["bank_name"])
+        batches = [list(group) for _, group in groupby(messages, key=lambda m: m["bank_name"])]
+        await asyncio.gather(*(self._send_bank_batch(batch) for batch in batches))
+        return len(messages)
+
+    async def run_forever(self, poll_seconds: float = 15):
+        """Background loop: send on enqueue, and poll for retries that came due"""
+        while True:
+            try:
+                while await self.dispatch_due():
+                    pass
+            except Exception as e:
+                print(f"Escalation dispatch error: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
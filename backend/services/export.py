@@ -0,0 +1,210 @@
+"""
+Case Export
+Spools one flat row per analyzed case to daily JSONL files and converts the
+spool into Parquet partitioned by date and scam type, in bounded memory.
+
+CLI (from backend/):
+    python -m services.export --spool cases --out exports [--since 2026-01-01]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime
+
+from data.scam_types import normalize_scam_type
+from nodes.results import to_payload
+
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+
+def flatten_case(state: dict) -> dict:
+    """Flatten a finished workflow state into one analytics row"""
+    evidence = to_payload(state.get("evidence"))
+    routing = to_payload(state.get("routing"))
+    report = to_payload(state.get("report"))
+    suspect_checks = evidence.get("suspect_checks", [])
+    llm_usage = state.get("llm_usage") or []
+
+    return {
+        "case_id": state.get("case_id"),
+        "analyzed_at": datetime.now().isoformat(timespec="seconds"),
+        "incident_date": state.get("incident_date"),
+        "workflow_mode": state.get("workflow_mode"),
+        "scam_type": normalize_scam_type(state.get("scam_type")),
+        "scam_confidence": state.get("scam_confidence"),
+        "urgency": state.get("urgency"),
+        "evidence_score": evidence.get("evidence_score"),
+        "amount": state.get("amount") or evidence.get("amount"),
+        "amount_category": evidence.get("amount_category"),
+        "bank_name": state.get("bank_name"),
+        "utr_validated": evidence.get("utr_validated"),
+        "suspect_checks": len(suspect_checks),
+        "suspects_flagged": sum(1 for check in suspect_checks if check["result"].get("found")),
+        "suspect_checks_json": json.dumps(suspect_checks),
+        "routing_success": routing.get("routing_success"),
+        "officers_routed": len(routing.get("nodal_officers", [])),
+        "report_priority": report.get("priority_level"),
+        "report_length": report.get("body_length"),
+        "report_meets_minimum": report.get("meets_minimum"),
+        "report_llm_fallback": "llm_error" in report,
+        "llm_input_tokens": sum(usage.get("input_tokens", 0) for usage in llm_usage),
+        "llm_output_tokens": sum(usage.get("output_tokens", 0) for usage in llm_usage)
+    }
+
+
+class CaseSpool:
+    """Append-only daily JSONL spool of flattened case rows"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, state: dict):
+        row = flatten_case(state)
+        path = os.path.join(self.directory, f"{row['analyzed_at'][:10]}.jsonl")
+        line = json.dumps(row) + "\n"
+        with self._lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("case_id", pa.string()),
+        ("analyzed_at", pa.string()),
+        ("incident_date", pa.string()),
+        ("workflow_mode", pa.string()),
+        ("scam_type", pa.string()),
+        ("scam_confidence", pa.float64()),
+        ("urgency", pa.string()),
+        ("evidence_score", pa.int32()),
+        ("amount", pa.float64()),
+        ("amount_category", pa.string()),
+        ("bank_name", pa.string()),
+        ("utr_validated", pa.bool_()),
+        ("suspect_checks", pa.int32()),
+        ("suspects_flagged", pa.int32()),
+        ("suspect_checks_json", pa.string()),
+        ("routing_success", pa.bool_()),
+        ("officers_routed", pa.int32()),
+        ("report_priority", pa.string()),
+        ("report_length", pa.int32()),
+        ("report_meets_minimum", pa.bool_()),
+        ("report_llm_fallback", pa.bool_()),
+        ("llm_input_tokens", pa.int64()),
+        ("llm_output_tokens", pa.int64())
+    ])
+
+
+class _PartitionWriter:
+    """Buffers rows for one date/scam_type partition and writes row groups"""
+
+    def __init__(self, path: str, schema, row_group_size: int):
+        self.path = path
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.rows = []
+        self.writer = None
+        self.row_count = 0
+
+    def add(self, row: dict):
+        self.rows.append(row)
+        if len(self.rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.row_count += len(self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+
+
+def export_parquet(spool_dir: str, out_dir: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                   since: str = None, until: str = None) -> dict:
+    """
+    Convert spooled cases to Parquet under out_dir/date=YYYY-MM-DD/scam_type=X/
+
+    Spool files are streamed line by line; at most row_group_size rows per
+    open partition are held in memory, and partitions are closed per day.
+    Re-exporting a day replaces that day's partitions.
+
+    Args:
+        spool_dir: Directory of daily JSONL spool files
+        out_dir: Output dataset root
+        row_group_size: Rows per Parquet row group
+        since / until: Optional inclusive YYYY-MM-DD bounds
+
+    Returns:
+        Summary with files written and row counts
+    """
+    try:
+        schema = _arrow_schema()
+    except ImportError as e:
+        raise RuntimeError("pyarrow is required for Parquet export") from e
+
+    run_id = uuid.uuid4().hex[:8]
+    summary = {"files": [], "rows": 0, "days": 0}
+
+    for filename in sorted(os.listdir(spool_dir)):
+        day = filename[:-len(".jsonl")]
+        if not filename.endswith(".jsonl") or (since and day < since) or (until and day > until):
+            continue
+
+        shutil.rmtree(os.path.join(out_dir, f"date={day}"), ignore_errors=True)
+        partitions = {}
+        with open(os.path.join(spool_dir, filename), encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                # Partition names become paths: never trust the spooled value
+                scam_type = row["scam_type"] = normalize_scam_type(row.get("scam_type"))
+                writer = partitions.get(scam_type)
+                if writer is None:
+                    path = os.path.join(out_dir, f"date={day}", f"scam_type={scam_type}", f"part-{run_id}.parquet")
+                    writer = partitions[scam_type] = _PartitionWriter(path, schema, row_group_size)
+                writer.add(row)
+
+        for writer in partitions.values():
+            writer.close()
+            summary["files"].append(writer.path)
+            summary["rows"] += writer.row_count
+        summary["days"] += 1
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export spooled cases to partitioned Parquet")
+    parser.add_argument("--spool", default=os.getenv("CASE_SPOOL_DIR", "cases"))
+    parser.add_argument("--out", default=os.getenv("CASE_EXPORT_DIR", "exports"))
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    parser.add_argument("--since", help="First day to export (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Last day to export (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    summary = export_parquet(args.spool, args.out, args.row_group_size, args.since, args.until)
+    print(f"Exported {summary['rows']} cases from {summary['days']} day(s) into {len(summary['files'])} file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Hedged, Deadline-bounded Calls
+Bounds every LLM call by a deadline and, once a call has run longer than the
+node's observed p95 latency, fires one duplicate and takes whichever answer
+arrives first. Hedges are capped to a fraction of calls to bound extra cost.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+from services import metrics
+
+
+class LatencyTracker:
+    """Rolling per-node latency samples for p95 estimates"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+
+    def record(self, node: str, latency_ms: float):
+        self._samples.setdefault(node, deque(maxlen=self.window)).append(latency_ms)
+
+    def p95(self, node: str) -> float:
+        samples = self._samples.get(node)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class HedgeBudget:
+    """Allows a hedge only while hedges stay under max_rate of the last `window` calls"""
+
+    def __init__(self, max_rate: float = 0.1, window: int = 500):
+        self.max_rate = max_rate
+        self.window = window
+        self._calls = 0
+        # Call sequence number current when each recent hedge was granted
+        self._hedges = deque()
+
+    def record_call(self):
+        self._calls += 1
+
+    def try_acquire(self) -> bool:
+        oldest = self._calls - self.window
+        while self._hedges and self._hedges[0] <= oldest:
+            self._hedges.popleft()
+        if len(self._hedges) + 1 > self.max_rate * min(self._calls, self.window):
+            return False
+        self._hedges.append(self._calls)
+        return True
+
+
+async def hedged_call(factory, node: str, timeout_s: float, tracker: LatencyTracker,
+                      budget: HedgeBudget, min_hedge_delay_ms: float = 0, hedging: bool = True) -> tuple:
+    """
+    Run factory() under a deadline, hedging once after the node's p95 latency
+
+    Args:
+        factory: Zero-argument callable returning a new awaitable attempt
+        node: Node name for latency tracking
+        timeout_s: Time left for this call; asyncio.TimeoutError when exceeded
+        tracker: Latency history used to pick the hedge delay
+        budget: Hedge rate cap
+        min_hedge_delay_ms: Never hedge earlier than this
+        hedging: Set False to only apply the deadline
+
+    Returns:
+        (result, info) where info has "hedged" and "winner" ("primary"/"hedge")
+    """
+    deadline = time.monotonic() + max(0.0, timeout_s)
+    budget.record_call()
+
+    labels = {}
+
+    def start(label: str) -> asyncio.Task:
+        started = time.perf_counter()
+        task = asyncio.ensure_future(factory())
+        labels[task] = label
+
+        def _record(done: asyncio.Task):
+            if not done.cancelled() and done.exception() is None:
+                tracker.record(node, (time.perf_counter() - started) * 1000)
+
+        task.add_done_callback(_record)
+        return task
+
+    pending = {start("primary")}
+    hedge_checked = False
+    hedged = False
+    p95 = tracker.p95(node) if hedging else None
+    hedge_at = time.monotonic() + max(p95, min_hedge_delay_ms) / 1000 if p95 is not None else None
+    last_error = None
+
+    try:
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                metrics.increment(f"llm.{node}.deadline_exceeded")
+                raise asyncio.TimeoutError(f"{node} LLM call exceeded its {timeout_s:.1f}s deadline")
+
+            wait_until = deadline
+            if not hedge_checked and hedge_at is not None:
+                wait_until = min(deadline, hedge_at)
+
+            done, pending = await asyncio.wait(pending, timeout=wait_until - now, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                if task.exception() is None:
+                    if labels[task] == "hedge":
+                        metrics.increment(f"llm.{node}.hedge_wins")
+                    return task.result(), {"hedged": hedged, "winner": labels[task]}
+                last_error = task.exception()
+
+            if not hedge_checked and hedge_at is not None and time.monotonic() >= hedge_at and pending:
+                hedge_checked = True
+                if budget.try_acquire():
+                    hedged = True
+                    metrics.increment(f"llm.{node}.hedges")
+                    pending.add(start("hedge"))
+                else:
+                    metrics.increment(f"llm.{node}.hedges_denied")
+
+        raise last_error
+    finally:
+        for task in pending:
+            task.cancel()
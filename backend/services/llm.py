@@ -0,0 +1,296 @@
+"""
+LLM Access Layer
+Shared Gemini helpers for the workflow nodes. LangChain and the Gemini client
+are imported on first use so processes that only serve the static lookup
+endpoints never pay for them.
+"""
+
+import asyncio
+import os
+import time
+
+from services import metrics
+from services.breaker import CircuitBreaker, CircuitOpenError
+from services.degradation import controller as degradation
+from services.hedging import LatencyTracker, HedgeBudget, hedged_call
+from services.partial_json import PartialJSONObject
+
+# Overall LLM time budget per /api/analyze request, split across nodes
+LLM_REQUEST_BUDGET_MS = float(os.getenv("LLM_REQUEST_BUDGET_MS", "25000"))
+# Timeout for calls made outside a workflow request (e.g. /api/triage)
+LLM_CALL_TIMEOUT_MS = float(os.getenv("LLM_CALL_TIMEOUT_MS", "15000"))
+# Share of the remaining budget each node may use; the report is the last call
+NODE_BUDGET_SHARE = {"triage": 0.4, "reporter": 1.0, "fused": 1.0}
+
+LLM_HEDGING = os.getenv("LLM_HEDGING", "true").lower() == "true"
+HEDGE_MIN_DELAY_MS = float(os.getenv("HEDGE_MIN_DELAY_MS", "500"))
+
+# Stream replies so early JSON fields can be published before the reply ends
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() == "true"
+
+latency_tracker = LatencyTracker()
+hedge_budget = HedgeBudget(max_rate=float(os.getenv("HEDGE_MAX_RATE", "0.1")))
+
+# Shared by every LLM call; while open, calls raise CircuitOpenError immediately
+breaker = CircuitBreaker(
+    failure_rate_threshold=float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5")),
+    window=int(os.getenv("LLM_BREAKER_WINDOW", "20")),
+    min_calls=int(os.getenv("LLM_BREAKER_MIN_CALLS", "5")),
+    open_seconds=float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+)
+
+
+def request_deadline() -> float:
+    """Monotonic deadline for the LLM calls of a new workflow request"""
+    return time.monotonic() + LLM_REQUEST_BUDGET_MS / 1000
+
+
+def node_timeout(node: str, deadline: float = None) -> float:
+    """Seconds a node's LLM call may take given the request deadline"""
+    if deadline is None:
+        return LLM_CALL_TIMEOUT_MS / 1000
+    return max(0.0, deadline - time.monotonic()) * NODE_BUDGET_SHARE.get(node, 1.0)
+
+
+def get_llm(temperature: float = 0.1):
+    """Build a Gemini chat model with the configured API key"""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model="gemini-1.5-flash",
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        temperature=temperature
+    )
+
+
+async def invoke_json_with_usage(template: str, variables: dict, temperature: float = 0.1,
+                                 node: str = "llm", deadline: float = None) -> tuple:
+    """
+    Render a prompt template, call Gemini and parse the JSON reply
+
+    Args:
+        template: ChatPromptTemplate string
+        variables: Values for the template placeholders
+        temperature: Sampling temperature
+        node: Workflow node making the call (for usage accounting)
+        deadline: Monotonic request deadline; the node gets its share of the time left
+
+    Returns:
+        (parsed JSON object, usage dict with token counts and latency)
+
+    Raises:
+        CircuitOpenError: the LLM circuit is open (raised before any work)
+    """
+    breaker.before_call()
+
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+
+    started = time.perf_counter()
+    try:
+        chain = ChatPromptTemplate.from_template(template) | get_llm(temperature)
+        message, hedge = await hedged_call(
+            lambda: chain.ainvoke(variables),
+            node=node,
+            timeout_s=node_timeout(node, deadline),
+            tracker=latency_tracker,
+            budget=hedge_budget,
+            min_hedge_delay_ms=HEDGE_MIN_DELAY_MS,
+            hedging=LLM_HEDGING
+        )
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
+    except Exception as e:
+        breaker.record_failure(e)
+        degradation.observe(node, (time.perf_counter() - started) * 1000, ok=False)
+        raise
+    latency_ms = (time.perf_counter() - started) * 1000
+    breaker.record_success()
+    degradation.observe(node, latency_ms, ok=True)
+
+    result = JsonOutputParser().invoke(message)
+    token_usage = getattr(message, "usage_metadata", None) or {}
+
+    usage = {
+        "node": node,
+        "input_tokens": token_usage.get("input_tokens", 0),
+        "output_tokens": token_usage.get("output_tokens", 0),
+        "latency_ms": round(latency_ms, 1),
+        "hedged": hedge["hedged"],
+        "winner": hedge["winner"]
+    }
+    return result, usage
+
+
+def chunk_text(content) -> str:
+    """Text of a streamed message chunk (plain string or list of content parts)"""
+    if isinstance(content, str):
+        return content
+    return "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+
+
+async def stream_json_with_usage(template: str, variables: dict, temperature: float = 0.1,
+                                 node: str = "llm", deadline: float = None, required: tuple = ()) -> tuple:
+    """
+    Stream a JSON reply from Gemini, returning once the required fields are complete
+
+    The call is bounded by the node's deadline share and goes through the
+    circuit breaker like invoke_json_with_usage. It is hedged on time to the
+    required fields: if none have been published after the node's p95 for that
+    (under the shared hedge budget), a second stream starts and whichever
+    publishes first is kept; the other is cancelled.
+
+    Returns:
+        (early fields dict, task resolving to (parsed JSON, usage dict) when the stream ends)
+
+    Raises:
+        CircuitOpenError: the LLM circuit is open (raised before any work)
+        Any stream or parse error that happens before the required fields arrive
+    """
+    breaker.before_call()
+
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+
+    ready = asyncio.get_running_loop().create_future()
+    started = time.perf_counter()
+    timeout_s = node_timeout(node, deadline)
+    stream_deadline = time.monotonic() + timeout_s
+    first_fields_node = f"{node}.first_fields"
+    attempts = {}
+    timing = {}
+
+    async def run_attempt(label: str, chain) -> tuple:
+        """One stream; publishes (label, fields) to `ready` if it gets there first"""
+        parser = PartialJSONObject()
+        attempt_started = time.perf_counter()
+
+        def publish(fields: dict):
+            if ready.done():
+                return
+            timing["first_fields_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            latency_tracker.record(first_fields_node, (time.perf_counter() - attempt_started) * 1000)
+            ready.set_result((label, fields))
+
+        async def consume():
+            message = None
+            async for chunk in chain.astream(variables):
+                message = chunk if message is None else message + chunk
+                parser.feed(chunk_text(chunk.content))
+                if all(field in parser.fields for field in required):
+                    publish(dict(parser.fields))
+            return message
+
+        remaining_s = max(0.0, stream_deadline - time.monotonic())
+        try:
+            message = await asyncio.wait_for(consume(), remaining_s)
+        except asyncio.TimeoutError:
+            metrics.increment(f"llm.{node}.deadline_exceeded")
+            raise asyncio.TimeoutError(f"{node} LLM stream exceeded its {timeout_s:.1f}s deadline")
+
+        result = JsonOutputParser().parse(chunk_text(message.content) if message else "")
+        # Stream ended without every required field: publish what there is
+        publish(result)
+        return result, message
+
+    def start(label: str, chain) -> asyncio.Task:
+        task = asyncio.ensure_future(run_attempt(label, chain))
+        # Failures are read by the coordinator or finish(); never log losers as unretrieved
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        attempts[label] = task
+        return task
+
+    hedge_checked = False
+    try:
+        chain = ChatPromptTemplate.from_template(template) | get_llm(temperature)
+        running = {start("primary", chain)}
+        p95 = latency_tracker.p95(first_fields_node) if LLM_HEDGING else None
+        hedge_at = time.monotonic() + max(p95, HEDGE_MIN_DELAY_MS) / 1000 if p95 is not None else None
+        hedge_budget.record_call()
+        last_error = None
+
+        while not ready.done():
+            timeout = None
+            if hedge_at is not None and not hedge_checked:
+                timeout = max(0.0, hedge_at - time.monotonic())
+            done, _ = await asyncio.wait(running | {ready}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if ready.done():
+                break
+
+            for task in done:
+                running.discard(task)
+                last_error = task.exception()
+            if not running:
+                raise last_error
+
+            if not hedge_checked and hedge_at is not None and time.monotonic() >= hedge_at:
+                hedge_checked = True
+                if hedge_budget.try_acquire():
+                    metrics.increment(f"llm.{node}.hedges")
+                    running.add(start("hedge", chain))
+                else:
+                    metrics.increment(f"llm.{node}.hedges_denied")
+    except asyncio.CancelledError:
+        for task in attempts.values():
+            task.cancel()
+        breaker.release()
+        raise
+    except Exception as e:
+        for task in attempts.values():
+            task.cancel()
+        breaker.record_failure(e)
+        degradation.observe(node, (time.perf_counter() - started) * 1000, ok=False)
+        raise
+
+    winner, early = ready.result()
+    for label, task in attempts.items():
+        if label != winner:
+            task.cancel()
+    if winner == "hedge":
+        metrics.increment(f"llm.{node}.hedge_wins")
+
+    async def finish() -> tuple:
+        """The winning stream's full reply and usage"""
+        try:
+            result, message = await attempts[winner]
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+
+        token_usage = getattr(message, "usage_metadata", None) or {}
+        usage = {
+            "node": node,
+            "input_tokens": token_usage.get("input_tokens", 0),
+            "output_tokens": token_usage.get("output_tokens", 0),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "first_fields_ms": timing["first_fields_ms"],
+            "hedged": len(attempts) > 1,
+            "winner": winner,
+            "streamed": True
+        }
+        return result, usage
+
+    remainder = asyncio.ensure_future(finish())
+    remainder.add_done_callback(lambda done: done.cancelled() or done.exception())
+    # Time to the required fields is what the rest of the request waits on
+    degradation.observe(node, timing["first_fields_ms"], ok=True)
+    return early, remainder
+
+
+async def invoke_json(template: str, variables: dict, temperature: float = 0.1, node: str = "llm",
+                      deadline: float = None) -> dict:
+    """Same as invoke_json_with_usage, returning only the parsed JSON"""
+    result, _ = await invoke_json_with_usage(template, variables, temperature, node, deadline)
+    return result
+
+
+def preload():
+    """Import the LLM stack ahead of the first request"""
+    import langchain_google_genai  # noqa: F401
+    import langchain_core.prompts  # noqa: F401
+    import langchain_core.output_parsers  # noqa: F401
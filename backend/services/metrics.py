@@ -0,0 +1,49 @@
+"""
+In-process Metrics
+Minimal counters and summaries exposed through /api/metrics
+"""
+
+import threading
+
+_lock = threading.Lock()
+_counters = {}
+_summaries = {}
+_gauges = {}
+
+
+def increment(name: str, value: float = 1):
+    """Add to a monotonically increasing counter"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, value: float):
+    """Record a sample (count / sum / max) for a summary"""
+    with _lock:
+        summary = _summaries.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+        summary["count"] += 1
+        summary["sum"] += value
+        summary["max"] = max(summary["max"], value)
+
+
+def set_gauge(name: str, value):
+    """Set a point-in-time value"""
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot() -> dict:
+    """Copy of all metrics, with summary means and speculation hit rate"""
+    with _lock:
+        counters = dict(_counters)
+        summaries = {
+            name: {**summary, "mean": summary["sum"] / summary["count"] if summary["count"] else 0.0}
+            for name, summary in _summaries.items()
+        }
+        gauges = dict(_gauges)
+
+    hits = counters.get("speculative.hits", 0)
+    misses = counters.get("speculative.misses", 0)
+    derived = {"speculative.hit_rate": hits / (hits + misses) if hits + misses else None}
+
+    return {"counters": counters, "summaries": summaries, "gauges": gauges, "derived": derived}
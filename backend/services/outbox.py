@@ -0,0 +1,154 @@
+"""
+Escalation Outbox
+Persistent SQLite queue of nodal officer emails with delivery status tracking
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    case_id TEXT NOT NULL,
+    bank_name TEXT NOT NULL,
+    officer_id INTEGER,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at REAL NOT NULL,
+    claimed_by INTEGER,
+    lease_expires_at REAL,
+    created_at TEXT NOT NULL,
+    sent_at TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbox_case ON outbox (case_id);
+"""
+
+STATUSES = ("pending", "sending", "sent", "failed")
+
+
+class Outbox:
+    """
+    SQLite-backed outbox; safe to share between the event loop and threads,
+    and between worker processes. A claimed message is leased to the claiming
+    process; only messages whose lease expired (the claimer died mid-send)
+    are claimed again.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 5, base_backoff_seconds: float = 30,
+                 lease_seconds: float = 300):
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def enqueue(self, case_id: str, messages: list) -> list:
+        """
+        Queue messages for delivery
+
+        Args:
+            case_id: Workflow case the messages belong to
+            messages: Dicts with bank_name, officer_id, recipient, subject, body
+
+        Returns:
+            Outbox ids of the queued messages
+        """
+        now = time.time()
+        created_at = datetime.now().isoformat()
+        ids = []
+        with self._lock:
+            self._db.execute("BEGIN")
+            for message in messages:
+                cursor = self._db.execute(
+                    "INSERT INTO outbox (case_id, bank_name, officer_id, recipient, subject, body, "
+                    "next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (case_id, message["bank_name"], message.get("officer_id"), message["recipient"],
+                     message["subject"], message["body"], now, created_at)
+                )
+                ids.append(cursor.lastrowid)
+            self._db.execute("COMMIT")
+        return ids
+
+    def claim_due(self, limit: int = 500) -> list:
+        """
+        Atomically lease due messages to this process and return them
+
+        Due means pending with next_attempt_at reached, or 'sending' under a
+        lease that expired without the claimer reporting back.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            rows = self._db.execute(
+                "SELECT * FROM outbox WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                "OR (status = 'sending' AND (lease_expires_at IS NULL OR lease_expires_at <= ?)) "
+                "ORDER BY id LIMIT ?",
+                (now, now, limit)
+            ).fetchall()
+            self._db.executemany(
+                "UPDATE outbox SET status = 'sending', attempts = attempts + 1, claimed_by = ?, "
+                "lease_expires_at = ? WHERE id = ?",
+                [(os.getpid(), now + self.lease_seconds, row["id"]) for row in rows]
+            )
+            self._db.execute("COMMIT")
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, message_ids: list):
+        with self._lock:
+            self._db.executemany(
+                "UPDATE outbox SET status = 'sent', sent_at = ?, last_error = NULL, "
+                "lease_expires_at = NULL WHERE id = ?",
+                [(datetime.now().isoformat(), message_id) for message_id in message_ids]
+            )
+
+    def mark_failed_attempt(self, message: dict, error: str):
+        """Schedule a retry with exponential backoff, or give up after max_attempts"""
+        attempts = message["attempts"] + 1
+        if attempts >= self.max_attempts:
+            status, next_attempt_at = "failed", message["next_attempt_at"]
+        else:
+            status = "pending"
+            next_attempt_at = time.time() + self.base_backoff_seconds * (2 ** (attempts - 1))
+
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET status = ?, last_error = ?, next_attempt_at = ?, "
+                "lease_expires_at = NULL WHERE id = ?",
+                (status, error[:500], next_attempt_at, message["id"])
+            )
+
+    def get(self, message_id: int) -> dict:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, case_id, bank_name, recipient, subject, status, attempts, last_error, "
+                "created_at, sent_at FROM outbox WHERE id = ?",
+                (message_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list_case(self, case_id: str) -> list:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, case_id, bank_name, recipient, subject, status, attempts, last_error, "
+                "created_at, sent_at FROM outbox WHERE case_id = ? ORDER BY id",
+                (case_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def status_counts(self) -> dict:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = {status: 0 for status in STATUSES}
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
@@ -0,0 +1,111 @@
+"""
+Incremental JSON Object Parser
+Consumes a streamed LLM reply chunk by chunk and exposes each top-level field
+of the JSON object as soon as its value is complete, so early fields can be
+used while later ones are still being generated. Text before the opening
+brace (e.g. a markdown code fence) is skipped.
+"""
+
+import json
+
+_WHITESPACE = " \t\r\n"
+
+
+class PartialJSONObject:
+    """Top-level fields of a JSON object parsed so far"""
+
+    def __init__(self):
+        self.fields = {}
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._state = "start"
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+        self._kind = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def _complete(self, end: int, new: dict):
+        try:
+            value = json.loads(self._text[self._value_start:end])
+        except ValueError:
+            value = None
+        else:
+            self.fields[self._key] = new[self._key] = value
+        self._state = "after_value"
+
+    def feed(self, chunk: str) -> dict:
+        """Add streamed text; returns the fields completed by this chunk"""
+        self._text += chunk
+        new = {}
+        text = self._text
+
+        while self._pos < len(text) and not self.done:
+            char = text[self._pos]
+            state = self._state
+
+            if state == "start":
+                if char == "{":
+                    self._state = "key_or_end"
+            elif state == "key_or_end":
+                if char == '"':
+                    self._key_start = self._pos
+                    self._state = "key"
+                elif char == "}":
+                    self.done = True
+            elif state == "key":
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._key = json.loads(text[self._key_start:self._pos + 1])
+                    self._state = "colon"
+            elif state == "colon":
+                if char == ":":
+                    self._state = "value_start"
+            elif state == "value_start":
+                if char not in _WHITESPACE:
+                    self._value_start = self._pos
+                    self._state = "value"
+                    if char == '"':
+                        self._kind, self._in_string = "string", True
+                    elif char in "{[":
+                        self._kind, self._depth = "container", 1
+                    else:
+                        self._kind = "scalar"
+            elif state == "value":
+                if self._kind == "scalar":
+                    if char in ",}" or char in _WHITESPACE:
+                        self._complete(self._pos, new)
+                        # Re-read the terminator as the separator
+                        continue
+                elif self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif char == "\\":
+                        self._escape = True
+                    elif char == '"':
+                        self._in_string = False
+                        if self._kind == "string":
+                            self._complete(self._pos + 1, new)
+                elif char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._complete(self._pos + 1, new)
+            elif state == "after_value":
+                if char == ",":
+                    self._state = "key_or_end"
+                elif char == "}":
+                    self.done = True
+
+            self._pos += 1
+
+        return new
@@ -0,0 +1,60 @@
+"""
+Pending Late Fields
+Registry of background tasks that finish a node's output after the node has
+already returned its early fields (e.g. triage reasoning still streaming while
+routing and the report run). Keyed by run / case id; whoever owns the run
+awaits resolve() before returning the final state.
+"""
+
+import asyncio
+
+_pending = {}
+
+
+def register(run_id: str, node: str, awaitable) -> asyncio.Task:
+    """Track an awaitable producing a late state delta for node"""
+    task = asyncio.ensure_future(awaitable)
+    _pending.setdefault(run_id, []).append((node, task))
+    return task
+
+
+async def resolve(run_id: str) -> dict:
+    """
+    Await every late delta of a run
+
+    Returns:
+        {node: delta}; nodes whose late work failed are logged and left out
+    """
+    late = {}
+    for node, task in _pending.pop(run_id, []):
+        try:
+            delta = await task
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Late {node} fields error: {e}")
+            continue
+        merged = late.setdefault(node, {})
+        for field, value in delta.items():
+            if field == "llm_usage":
+                merged["llm_usage"] = merged.get("llm_usage", []) + value
+            else:
+                merged[field] = value
+    return late
+
+
+def merge_late(state: dict, late: dict) -> dict:
+    """Apply resolved late deltas to a final state in place"""
+    for delta in late.values():
+        for field, value in delta.items():
+            if field == "llm_usage":
+                state["llm_usage"] = list(state.get("llm_usage") or []) + value
+            else:
+                state[field] = value
+    return state
+
+
+def discard(run_id: str):
+    """Cancel the late work of a run that will not complete"""
+    for _, task in _pending.pop(run_id, []):
+        task.cancel()
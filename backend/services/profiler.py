@@ -0,0 +1,214 @@
+"""
+Live Process Profiling
+Low-overhead sampling profiler over sys._current_frames() and tracemalloc
+snapshot diffing for the running API process. Stacks are folded in the
+flamegraph.pl / speedscope format and prefixed with the route and workflow
+node found on the stack.
+"""
+
+import os
+import random
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+# Workflow node functions and the node name they are attributed to
+NODE_FUNCTIONS = {
+    "triage_auditor": "triage",
+    "evidence_collector": "evidence",
+    "nodal_router": "router",
+    "portal_reporter": "reporter",
+    "fused_triage_reporter": "fused",
+    "speculative_triage_reporter": "speculative"
+}
+NODE_FILES = {f"{name}.py": name for name in ("triage", "evidence", "router", "reporter", "fused", "speculative")}
+
+MAX_STACK_DEPTH = 64
+
+# Endpoint function name -> route path, filled in once the app is assembled
+_route_names = {}
+
+
+def set_routes(routes: list, aliases: dict = None):
+    """Index route endpoints by function name (aliases cover work run in separate tasks)"""
+    _route_names.clear()
+    for route in routes:
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is not None and hasattr(route, "path"):
+            _route_names[endpoint.__name__] = route.path
+    _route_names.update(aliases or {})
+
+
+def fold_frame(frame) -> tuple:
+    """(folded stack string, route, node) for one thread's current frame"""
+    names = []
+    route = node = None
+    depth = 0
+    while frame is not None and depth < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        # Innermost match wins for the node, outermost for the route
+        node = node or NODE_FUNCTIONS.get(code.co_name)
+        route = _route_names.get(code.co_name, route)
+        frame = frame.f_back
+        depth += 1
+
+    names.reverse()
+    prefix = [f"route:{route or 'none'}", f"node:{node or 'none'}"]
+    return ";".join(prefix + names), route, node
+
+
+class SamplingProfiler:
+    """Background thread sampling every other thread's stack at a fixed interval"""
+
+    def __init__(self, interval_ms: float = 5, max_stacks: int = 5000):
+        self.interval_ms = interval_ms
+        self.max_stacks = max_stacks
+        self.stacks = Counter()
+        self.by_route = Counter()
+        self.by_node = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _sample(self):
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack, route, node = fold_frame(frame)
+            with self._lock:
+                if stack in self.stacks or len(self.stacks) < self.max_stacks:
+                    self.stacks[stack] += 1
+                else:
+                    self.stacks["[truncated]"] += 1
+                self.by_route[route or "none"] += 1
+                self.by_node[node or "none"] += 1
+                self.samples += 1
+
+    def _run(self, stop: threading.Event):
+        interval = self.interval_ms / 1000
+        while not stop.wait(interval):
+            self._sample()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        # Fresh event per thread so a restart never races a thread still winding down
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop sampling; wait=False returns at once (the thread exits within one interval)"""
+        self._stop.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+        self._thread = None
+
+    def reset(self):
+        with self._lock:
+            self.stacks.clear()
+            self.by_route.clear()
+            self.by_node.clear()
+            self.samples = 0
+
+    def folded(self) -> str:
+        """One 'frame;frame;frame count' line per distinct stack"""
+        with self._lock:
+            return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def report(self, top: int = 50) -> dict:
+        with self._lock:
+            return {
+                "samples": self.samples,
+                "interval_ms": self.interval_ms,
+                "by_route": dict(self.by_route.most_common()),
+                "by_node": dict(self.by_node.most_common()),
+                "top_stacks": [{"stack": stack, "count": count} for stack, count in self.stacks.most_common(top)]
+            }
+
+
+class ContinuousProfiler:
+    """
+    Samples while at least one selected /api/analyze request is in flight.
+    Stacks accumulate until reset, so rare requests still build a profile.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, interval_ms: float = 10):
+        self.sample_rate = sample_rate
+        self.profiler = SamplingProfiler(interval_ms=interval_ms)
+        self.requests_sampled = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def maybe_sample(self):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            yield False
+            return
+
+        with self._lock:
+            self._active += 1
+            self.requests_sampled += 1
+            if self._active == 1:
+                self.profiler.start()
+        try:
+            yield True
+        finally:
+            with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    # Called on the event loop: do not block on the sampler thread
+                    self.profiler.stop(wait=False)
+
+    def report(self, top: int = 50) -> dict:
+        return {"sample_rate": self.sample_rate, "requests_sampled": self.requests_sampled,
+                **self.profiler.report(top)}
+
+
+def allocation_diff(before, after, top: int = 25) -> list:
+    """Largest allocation growth between two tracemalloc snapshots, attributed to nodes"""
+    stats = after.compare_to(before, "traceback")
+    results = []
+    for stat in stats[:top]:
+        node = None
+        for frame in stat.traceback:
+            parts = frame.filename.replace("\\", "/").split("/")
+            if len(parts) >= 2 and parts[-2] == "nodes" and parts[-1] in NODE_FILES:
+                node = NODE_FILES[parts[-1]]
+                break
+        results.append({
+            "size_diff_bytes": stat.size_diff,
+            "count_diff": stat.count_diff,
+            "size_bytes": stat.size,
+            "node": node,
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+        })
+    return results
+
+
+def take_snapshot():
+    """tracemalloc snapshot without tracemalloc's own allocations"""
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def start_tracing(frames: int = 25) -> bool:
+    """Start tracemalloc if needed; returns True if this call started it"""
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(frames)
+    return True
+
+
+continuous = ContinuousProfiler(
+    sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+    interval_ms=float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+)
@@ -0,0 +1,154 @@
+"""
+Rate Limiting
+Per-route GCRA (generic cell rate algorithm) limiters keyed by client IP and
+API key. Each client costs one float (its theoretical arrival time); entries
+that have fully replenished are evicted when idle.
+
+RATE_LIMITS format: "[METHOD[,METHOD] ]<route>:<scope>=<count>/<seconds>[,...];..."
+where scope is ip or key, e.g. "/api/analyze:ip=10/60,key=30/60;/api/test-key:ip=5/60".
+A route also covers its sub-paths (/api/sessions covers /api/sessions/{id}).
+Method-qualified entries win over plain ones for the same route, so requests
+that run the LLM pipeline (session create/PATCH) can be held to the
+/api/analyze budget while cheap reads get a looser one.
+"""
+
+import hashlib
+import math
+import time
+
+from services import metrics
+
+DEFAULT_RATE_LIMITS = (
+    "/api/analyze:ip=10/60,key=30/60;"
+    "/api/test-key:ip=5/60;"
+    "/api/triage:ip=30/60;"
+    "POST,PATCH /api/sessions:ip=10/60,key=30/60;"
+    "/api/sessions:ip=60/60"
+)
+
+
+class GCRALimiter:
+    """count requests per period_seconds with a burst of count, per identity"""
+
+    def __init__(self, count: int, period_seconds: float, max_keys: int = 100000,
+                 sweep_interval_seconds: float = 60):
+        self.count = count
+        self.period_seconds = period_seconds
+        self.emission_interval = period_seconds / count
+        self.tolerance = self.emission_interval * (count - 1)
+        self.max_keys = max_keys
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._tat = {}
+        self._next_sweep = time.monotonic() + sweep_interval_seconds
+
+    def check(self, identity: str, now: float) -> tuple:
+        """(allowed, retry_after_seconds, new_tat) without recording the request"""
+        tat = max(self._tat.get(identity, now), now)
+        allow_at = tat - self.tolerance
+        if now < allow_at:
+            return False, allow_at - now, tat
+        return True, 0.0, tat + self.emission_interval
+
+    def commit(self, identity: str, new_tat: float, now: float):
+        self._tat[identity] = new_tat
+        if now >= self._next_sweep or len(self._tat) > self.max_keys:
+            self.evict_idle(now)
+
+    def evict_idle(self, now: float):
+        """Drop identities whose allowance has fully replenished"""
+        self._tat = {identity: tat for identity, tat in self._tat.items() if tat > now}
+        self._next_sweep = now + self.sweep_interval_seconds
+        # Still over the cap: keep the clients that are closest to their limit
+        if len(self._tat) > self.max_keys:
+            keep = sorted(self._tat.items(), key=lambda item: item[1], reverse=True)[:self.max_keys]
+            self._tat = dict(keep)
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+def split_route(route: str) -> tuple:
+    """Split 'POST,PATCH /api/sessions' into ({"POST", "PATCH"}, "/api/sessions"); methods are None if absent"""
+    methods, _, path = route.strip().rpartition(" ")
+    if not methods:
+        return None, path
+    return frozenset(method.strip().upper() for method in methods.split(",") if method.strip()), path
+
+
+def parse_rate_limits(spec: str) -> dict:
+    """Parse RATE_LIMITS into {route: [(scope, count, seconds), ...]}"""
+    routes = {}
+    for entry in filter(None, (part.strip() for part in spec.split(";"))):
+        route, _, rules = entry.rpartition(":")
+        if not route:
+            raise ValueError(f"Rate limit entry needs '<route>:<rules>': {entry!r}")
+        for rule in filter(None, (part.strip() for part in rules.split(","))):
+            scope, _, limit = rule.partition("=")
+            count, _, seconds = limit.partition("/")
+            if scope not in ("ip", "key") or not count or not seconds:
+                raise ValueError(f"Invalid rate limit rule {rule!r} for {route}")
+            routes.setdefault(route.strip(), []).append((scope, int(count), float(seconds)))
+    return routes
+
+
+class RateLimiter:
+    """Admission control for the configured routes"""
+
+    def __init__(self, spec: str = DEFAULT_RATE_LIMITS, max_keys: int = 100000):
+        self.rules = {
+            route: [(scope, GCRALimiter(count, seconds, max_keys=max_keys)) for scope, count, seconds in rules]
+            for route, rules in parse_rate_limits(spec).items()
+        }
+        # Longest path first, method-qualified before plain, so the most specific entry wins
+        self._routes = sorted(
+            ((route, *split_route(route)) for route in self.rules),
+            key=lambda entry: (len(entry[2]), entry[1] is not None),
+            reverse=True
+        )
+
+    def match(self, path: str, method: str = None) -> str:
+        for route, methods, prefix in self._routes:
+            if methods is not None and method not in methods:
+                continue
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return route
+        return None
+
+    def admit(self, path: str, client_ip: str, api_key: str = None, method: str = None) -> tuple:
+        """
+        Check and record one request
+
+        Returns:
+            (allowed, retry_after_seconds, scope that rejected it or None)
+        """
+        route = self.match(path, method)
+        if route is None:
+            return True, 0, None
+
+        identities = {"ip": client_ip}
+        if api_key:
+            # Never keep raw API keys in limiter state
+            identities["key"] = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+        now = time.monotonic()
+        decisions = []
+        for scope, limiter in self.rules[route]:
+            identity = identities.get(scope)
+            if identity is None:
+                continue
+            allowed, retry_after, new_tat = limiter.check(identity, now)
+            if not allowed:
+                metrics.increment(f"ratelimit.rejected.{scope}")
+                return False, math.ceil(retry_after), scope
+            decisions.append((limiter, identity, new_tat))
+
+        # Only consume allowance once every limit has admitted the request
+        for limiter, identity, new_tat in decisions:
+            limiter.commit(identity, new_tat, now)
+        return True, 0, None
+
+    def stats(self) -> dict:
+        return {
+            route: {f"{scope}={limiter.count}/{limiter.period_seconds:g}s": len(limiter) for scope, limiter in rules}
+            for route, rules in self.rules.items()
+        }
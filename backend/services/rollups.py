@@ -0,0 +1,173 @@
+"""
+Analytics Rollups
+Complaint counts and rupees lost per scam type, bank and urgency, maintained
+incrementally in tumbling hourly windows as each workflow completes. Counters
+live in SQLite and are updated with additive upserts, so every pre-fork worker
+adds to (and /api/stats reads) the same totals. Hourly buckets older than the
+hourly retention are compacted into daily buckets and daily buckets past their
+retention are dropped.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from data.scam_types import normalize_scam_type
+from nodes.results import to_payload
+
+DIMENSIONS = ("all", "scam_type", "bank", "urgency")
+
+HOUR = 3600
+DAY = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    granularity TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    PRIMARY KEY (granularity, dimension, bucket, value)
+);
+"""
+
+UPSERT = (
+    "INSERT INTO rollups (granularity, dimension, bucket, value, count, amount) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (granularity, dimension, bucket, value) "
+    "DO UPDATE SET count = count + excluded.count, amount = amount + excluded.amount"
+)
+
+
+def _bucket_label(bucket: int) -> str:
+    return datetime.fromtimestamp(bucket, tz=timezone.utc).isoformat()
+
+
+class RollupStore:
+    """Tumbling-window counters: rows of (granularity, dimension, bucket_start, value) -> count, amount"""
+
+    def __init__(self, path: str = None, hourly_retention_hours: int = 72,
+                 daily_retention_days: int = 400):
+        self.path = path or ":memory:"
+        self.hourly_retention = hourly_retention_hours * HOUR
+        self.daily_retention = daily_retention_days * DAY
+        self._lock = threading.Lock()
+        self._last_compaction = 0.0
+        self._db = None
+        self._pid = None
+
+    def _conn(self) -> sqlite3.Connection:
+        """This process's connection, opened on first use (never inherited across fork)"""
+        if self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._pid = os.getpid()
+            if self.path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    # ---- updates ----
+
+    def record(self, state: dict, timestamp: float = None):
+        """Add one completed workflow to the current hourly window"""
+        timestamp = timestamp or time.time()
+        bucket = int(timestamp // HOUR * HOUR)
+        # Evidence carries the amount parsed from the complaint when the form left it empty
+        amount = float(state.get("amount") or to_payload(state.get("evidence")).get("amount") or 0)
+        values = {
+            "all": "all",
+            "scam_type": normalize_scam_type(state.get("scam_type")),
+            "bank": state.get("bank_name") or "unknown",
+            "urgency": state.get("urgency") or "medium"
+        }
+
+        with self._lock:
+            self._conn().executemany(UPSERT, [
+                ("hour", dimension, bucket, value, 1, amount) for dimension, value in values.items()
+            ])
+
+        if timestamp - self._last_compaction >= HOUR:
+            self.compact(timestamp)
+
+    def compact(self, now: float = None):
+        """Fold expired hourly buckets into daily ones and drop expired days"""
+        now = now or time.time()
+        hourly_cutoff = now - self.hourly_retention
+        daily_cutoff = now - self.daily_retention
+
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                expired = db.execute(
+                    "SELECT dimension, bucket / ? * ?, value, SUM(count), SUM(amount) FROM rollups "
+                    "WHERE granularity = 'hour' AND bucket < ? GROUP BY 1, 2, 3",
+                    (DAY, DAY, hourly_cutoff)
+                ).fetchall()
+                db.executemany(UPSERT, [("day", *row) for row in expired])
+                db.execute("DELETE FROM rollups WHERE granularity = 'hour' AND bucket < ?", (hourly_cutoff,))
+                db.execute("DELETE FROM rollups WHERE granularity = 'day' AND bucket < ?", (daily_cutoff,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self._last_compaction = now
+
+    # ---- queries ----
+
+    def query(self, dimension: str, granularity: str = "hour", since: float = None, until: float = None) -> dict:
+        """
+        Time series and totals for one dimension
+
+        Cost is proportional to the number of buckets in range, not the
+        number of cases. Daily queries include hourly buckets not yet compacted.
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dimension}'. Use one of: {', '.join(DIMENSIONS)}")
+        if granularity not in ("hour", "day"):
+            raise ValueError("granularity must be 'hour' or 'day'")
+
+        since = int(since or 0)
+        until = int(until or time.time())
+        size = HOUR if granularity == "hour" else DAY
+        sources = ("hour",) if granularity == "hour" else ("hour", "day")
+
+        with self._lock:
+            rows = self._conn().execute(
+                f"SELECT bucket / ? * ?, value, SUM(count), SUM(amount) FROM rollups "
+                f"WHERE dimension = ? AND granularity IN ({', '.join('?' for _ in sources)}) "
+                f"AND bucket BETWEEN ? AND ? GROUP BY 1, 2",
+                (size, size, dimension, *sources, since, until)
+            ).fetchall()
+
+        series = {}
+        totals = {}
+        for bucket, value, count, amount in rows:
+            series.setdefault(bucket, {})[value] = (count, amount)
+            counters = totals.setdefault(value, [0, 0.0])
+            counters[0] += count
+            counters[1] += amount
+
+        return {
+            "dimension": dimension,
+            "granularity": granularity,
+            "buckets": [
+                {
+                    "start": _bucket_label(bucket),
+                    "values": {v: {"count": c, "amount": round(a, 2)} for v, (c, a) in values.items()}
+                }
+                for bucket, values in sorted(series.items())
+            ],
+            "totals": {v: {"count": c, "amount": round(a, 2)} for v, (c, a) in totals.items()}
+        }
+
+    # ---- persistence ----
+
+    def close(self):
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
+        self._pid = None
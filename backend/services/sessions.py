@@ -0,0 +1,184 @@
+"""
+Wizard Sessions
+Server-side workflow state for the step-by-step wizard. Fields are patched
+one step at a time; each node is memoized on a hash of the inputs it actually
+reads, so a re-evaluation only re-runs nodes whose inputs changed (editing
+suspect_phone re-runs evidence, never triage).
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from nodes.triage import triage_auditor
+from nodes.evidence import evidence_collector
+from nodes.router import nodal_router
+from nodes.reporter import portal_reporter, report_fields
+from services import pending
+from services.degradation import MODES
+from services.llm import request_deadline
+
+SESSION_FIELDS = (
+    "complaint", "utr", "bank_name", "amount", "suspect_phone", "suspect_url",
+    "incident_date", "victim_name", "victim_phone"
+)
+
+
+def _evidence_inputs(state: dict) -> dict:
+    return {field: state.get(field) for field in
+            ("complaint", "utr", "bank_name", "amount", "suspect_phone", "suspect_url")}
+
+
+def _router_inputs(state: dict) -> dict:
+    return {"bank_name": state.get("resolved_bank_name"), "scam_type": state.get("scam_type"),
+            "urgency": state.get("urgency")}
+
+
+def _reporter_inputs(state: dict) -> dict:
+    return {**report_fields({**state, "bank_name": state.get("resolved_bank_name")}),
+            "incident_date": state.get("incident_date")}
+
+
+# Standard pipeline order: (name, node, inputs it reads, needs a complaint)
+NODE_PLAN = (
+    ("triage", triage_auditor, lambda state: {"complaint": state.get("complaint")}, True),
+    ("evidence", evidence_collector, _evidence_inputs, False),
+    ("router", nodal_router, _router_inputs, False),
+    ("reporter", portal_reporter, _reporter_inputs, True),
+)
+
+
+def inputs_key(inputs: dict) -> str:
+    encoded = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class WizardSession:
+    """Patched input fields plus the memoized output of each node"""
+
+    def __init__(self, session_id: str, fields: dict):
+        self.session_id = session_id
+        self.case_id = uuid.uuid4().hex
+        self.fields = {field: fields.get(field) for field in SESSION_FIELDS}
+        self.memo = {}
+        self.state = {}
+        self.version = 0
+        self.lock = asyncio.Lock()
+        # Side effects applied once per case by the API layer
+        self.escalate = False
+        self.escalation = None
+        self.recorded = False
+
+    def patch(self, changes: dict) -> list:
+        """Apply field changes; returns the names of fields whose value changed"""
+        changed = [field for field, value in changes.items()
+                   if field in SESSION_FIELDS and self.fields.get(field) != value]
+        for field in changed:
+            self.fields[field] = changes[field]
+        if changed:
+            self.version += 1
+        return changed
+
+    async def evaluate(self, pipeline_mode: str = "full") -> dict:
+        """
+        Bring every node up to date with the current fields
+
+        A memoized node output is reused when its inputs hash matches and it was
+        produced in the same or a less degraded pipeline mode. Outputs from
+        failed LLM calls are never reused.
+
+        Returns:
+            Merged workflow state plus "nodes" (ran/reused per node) and the
+            llm_usage of nodes that ran on this evaluation
+        """
+        state = {
+            **self.fields,
+            "case_id": self.case_id,
+            "pipeline_mode": pipeline_mode,
+            "deadline": request_deadline()
+        }
+        state["resolved_bank_name"] = state.get("bank_name")
+        llm_usage = []
+        node_status = {}
+
+        try:
+            for name, node, read_inputs, needs_complaint in NODE_PLAN:
+                if needs_complaint and not state.get("complaint"):
+                    node_status[name] = "waiting"
+                    continue
+
+                key = inputs_key(read_inputs(state))
+                cached = self.memo.get(name)
+                if (cached and cached["key"] == key
+                        and MODES.index(cached["pipeline_mode"]) <= MODES.index(pipeline_mode)):
+                    delta = cached["delta"]
+                    node_status[name] = "reused"
+                else:
+                    delta = await node({**state, "bank_name": state["resolved_bank_name"]})
+                    llm_usage.extend(delta.pop("llm_usage", []))
+                    if "error" in delta or getattr(delta.get("report"), "llm_error", None):
+                        self.memo.pop(name, None)
+                    else:
+                        self.memo[name] = {"key": key, "pipeline_mode": pipeline_mode, "delta": delta}
+                    node_status[name] = "ran"
+
+                delta = dict(delta)
+                if name == "evidence":
+                    state["resolved_bank_name"] = delta.pop("bank_name", state.get("bank_name"))
+                state.update(delta)
+        except BaseException:
+            pending.discard(self.case_id)
+            raise
+
+        # Streamed nodes finish in the background; fold their late fields into state and memo
+        for name, delta in (await pending.resolve(self.case_id)).items():
+            llm_usage.extend(delta.pop("llm_usage", []))
+            state.update(delta)
+            if name in self.memo:
+                self.memo[name]["delta"] = {**self.memo[name]["delta"], **delta}
+
+        state.pop("deadline", None)
+        state["bank_name"] = state.pop("resolved_bank_name")
+        state["nodes"] = node_status
+        state["llm_usage"] = llm_usage
+        state["workflow_complete"] = all(status != "waiting" for status in node_status.values())
+        self.state = state
+        return state
+
+
+class SessionStore:
+    """Wizard sessions kept in memory with an idle TTL and a size cap"""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._sessions: OrderedDict = OrderedDict()
+
+    def create(self, fields: dict) -> WizardSession:
+        session = WizardSession(uuid.uuid4().hex, fields)
+        self._sessions[session.session_id] = (time.monotonic() + self.ttl_seconds, session)
+        while len(self._sessions) > self.max_entries:
+            self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id: str) -> Optional[WizardSession]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+
+        expires_at, session = entry
+        if expires_at < time.monotonic():
+            del self._sessions[session_id]
+            return None
+
+        # Sliding expiry: every access extends the session
+        self._sessions[session_id] = (time.monotonic() + self.ttl_seconds, session)
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def stats(self) -> dict:
+        return {"active": len(self._sessions), "ttl_seconds": self.ttl_seconds}
@@ -0,0 +1,62 @@
+"""
+Startup Warm-up
+Loads the LangGraph workflow and LLM stack in the background so the first
+/api/analyze call does not pay the import and compile cost
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+_status = {
+    "ready": False,
+    "warm_up": "enabled",
+    "started_at": None,
+    "completed_at": None,
+    "duration_ms": None,
+    "error": None
+}
+
+
+def load_workflow():
+    """Import the LLM stack and compile the workflow (blocking)"""
+    from graph import get_fraud_workflow, WORKFLOW_MODES
+    from services.llm import preload
+
+    preload()
+    for mode in WORKFLOW_MODES:
+        get_fraud_workflow(mode)
+
+
+async def warm_up():
+    """Run load_workflow in a worker thread and record readiness"""
+    _status["started_at"] = datetime.now().isoformat()
+    started = time.perf_counter()
+
+    try:
+        await asyncio.to_thread(load_workflow)
+        _status["ready"] = True
+        _status["error"] = None
+    except Exception as e:
+        print(f"Warm-up error: {e}")
+        _status["error"] = str(e)
+    finally:
+        _status["completed_at"] = datetime.now().isoformat()
+        _status["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def mark_ready():
+    """Record that the workflow was loaded on demand"""
+    _status["ready"] = True
+
+
+def skip_warm_up():
+    """Warm-up disabled: the workflow loads lazily on first use, so serve traffic now"""
+    _status["ready"] = True
+    _status["error"] = None
+    _status["warm_up"] = "disabled"
+
+
+def readiness() -> dict:
+    """Current warm-up status"""
+    return dict(_status)
@@ -0,0 +1,14 @@
+"""
+Test setup: run from backend/ (python -m pytest) with the backend modules
+importable and no files written outside pytest's temp directories
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main.py reads these at import time
+os.environ.setdefault("ROLLUP_PATH", os.path.join(tempfile.mkdtemp(prefix="rollups-"), "rollups.sqlite3"))
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
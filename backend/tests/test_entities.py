@@ -0,0 +1,26 @@
+import time
+
+import pytest
+
+from services.entities import extract_entities
+
+
+@pytest.mark.parametrize("text", ["a." * 50000, "1.2.3.4." * 12500, "x-." * 33333 + "@okaxis"])
+def test_long_dotted_runs_scan_in_linear_time(text):
+    """Unbounded label repetition used to backtrack quadratically (16k chars took ~17s)"""
+    started = time.perf_counter()
+    extract_entities(text)
+    assert time.perf_counter() - started < 2.0
+
+
+def test_bounded_pattern_still_extracts():
+    entities = extract_entities(
+        "Paid Rs. 2 lakh, UTR 916543210987, to fraud@okaxis via sub.fake-bank.co.in/login. "
+        "Mail from john.doe@gmail.com; met him.In the morning"
+    )
+    assert [(e["type"], e["canonical"]) for e in entities] == [
+        ("amount", 200000.0),
+        ("utr", "916543210987"),
+        ("upi", "fraud@okaxis"),
+        ("url", "sub.fake-bank.co.in")
+    ]
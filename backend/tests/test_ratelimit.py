@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+from services.ratelimit import RateLimiter
+
+
+def test_spoofed_forwarded_for_does_not_change_rate_limit_key(monkeypatch):
+    """Behind one trusted proxy, only the entry the proxy appended identifies the client"""
+    import main
+
+    monkeypatch.setattr(main, "TRUST_PROXY_HEADERS", True)
+    monkeypatch.setattr(main, "TRUSTED_PROXY_HOPS", 1)
+    monkeypatch.setattr(main, "rate_limiter", RateLimiter("/api/health:ip=1/60"))
+    client = TestClient(main.app)
+
+    first = client.get("/api/health", headers={"X-Forwarded-For": "198.51.100.1, 203.0.113.7"})
+    spoofed = client.get("/api/health", headers={"X-Forwarded-For": "198.51.100.2, 203.0.113.7"})
+    other_client = client.get("/api/health", headers={"X-Forwarded-For": "198.51.100.1, 203.0.113.8"})
+
+    assert first.status_code == 200
+    assert spoofed.status_code == 429
+    assert other_client.status_code == 200
@@ -0,0 +1,18 @@
+import asyncio
+
+from nodes.evidence import evidence_collector
+from services.export import flatten_case
+from services.rollups import RollupStore
+
+
+def test_amount_falls_back_to_complaint_text():
+    """A complaint naming the loss but no form amount is counted at the parsed amount, not 0"""
+    state = {"complaint": "I transferred Rs. 2 lakh to a fake trading app", "amount": None, "scam_type": "investment_scam"}
+    state.update(asyncio.run(evidence_collector(state)))
+
+    store = RollupStore()
+    store.record(state)
+    assert store.query("all")["totals"]["all"] == {"count": 1, "amount": 200000.0}
+    store.close()
+
+    assert flatten_case(state)["amount"] == 200000.0
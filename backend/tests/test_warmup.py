@@ -0,0 +1,18 @@
+from fastapi.testclient import TestClient
+
+from services import warmup
+
+
+def test_ready_without_warm_up(monkeypatch):
+    """With WARMUP_ON_STARTUP=false the workflow loads lazily, so the instance is ready at startup"""
+    import main
+
+    monkeypatch.setenv("WARMUP_ON_STARTUP", "false")
+    monkeypatch.setitem(warmup._status, "ready", False)
+
+    with TestClient(main.app) as client:
+        response = client.get("/api/ready")
+
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+    assert response.json()["warm_up"] == "disabled"
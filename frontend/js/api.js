@@ -48,15 +48,27 @@ const API = {
 
     /**
      * Run the complete 4-node fraud analysis workflow
+     * Every submission carries an Idempotency-Key; a request lost to a network
+     * error is retried once with the same key so the backend replays the first run
      */
-    async analyzeFraud(data) {
+    async analyzeFraud(data, idempotencyKey = crypto.randomUUID()) {
         try {
-            const response = await fetch(`${API_BASE_URL}/api/analyze`, {
+            const headers = this.getHeaders();
+            headers['Idempotency-Key'] = idempotencyKey;
+
+            const request = () => fetch(`${API_BASE_URL}/api/analyze`, {
                 method: 'POST',
-                headers: this.getHeaders(),
+                headers,
                 body: JSON.stringify(data),
             });
 
+            let response;
+            try {
+                response = await request();
+            } catch (networkError) {
+                response = await request();
+            }
+
             if (!response.ok) {
                 const error = await response.json().catch(() => ({}));
                 throw new Error(error.detail || `API error: ${response.status}`);
@@ -69,6 +81,45 @@ const API = {
         }
     },
 
+    /**
+     * Analyze within a wizard session: the first call creates the session,
+     * later calls PATCH it so the backend only re-runs nodes whose inputs changed.
+     * Creations sharing a createKey (e.g. a double-clicked submit) share one session.
+     */
+    async analyzeInSession(data, sessionId = null, createKey = crypto.randomUUID()) {
+        try {
+            let response = null;
+            if (sessionId) {
+                response = await fetch(`${API_BASE_URL}/api/sessions/${sessionId}`, {
+                    method: 'PATCH',
+                    headers: this.getHeaders(),
+                    body: JSON.stringify(data),
+                });
+            }
+
+            // No session yet, or it expired on the server (a new session needs a new key)
+            if (!response || response.status === 404) {
+                const headers = this.getHeaders();
+                headers['Idempotency-Key'] = response ? crypto.randomUUID() : createKey;
+                response = await fetch(`${API_BASE_URL}/api/sessions`, {
+                    method: 'POST',
+                    headers,
+                    body: JSON.stringify(data),
+                });
+            }
+
+            if (!response.ok) {
+                const error = await response.json().catch(() => ({}));
+                throw new Error(error.detail || `API error: ${response.status}`);
+            }
+
+            return await response.json();
+        } catch (error) {
+            console.error('Session analyze error:', error);
+            throw error;
+        }
+    },
+
     /**
      * Quick triage analysis only
      */
@@ -5,6 +5,8 @@
 
 let currentStep = 1;
 let analysisResult = null;
+let analysisSessionId = null;
+let analysisCreateKey = null;
 
 /**
  * Navigate to next step
@@ -66,6 +68,23 @@ function goToStep(step) {
     document.getElementById('report').scrollIntoView({ behavior: 'smooth' });
 }
 
+/**
+ * Start a new report: clear the form and forget the previous analysis session
+ * (a reused session or create key would replay or PATCH the old complaint)
+ */
+function resetWizard() {
+    document.querySelectorAll('#wizardContainer .form-input').forEach(input => {
+        input.value = '';
+    });
+    document.getElementById('charCount').textContent = '0';
+
+    analysisResult = null;
+    analysisSessionId = null;
+    analysisCreateKey = null;
+
+    goToStep(1);
+}
+
 /**
  * Run AI analysis workflow
  */
@@ -102,7 +121,12 @@ async function runAnalysis() {
 
     try {
         // Call API
-        const result = await API.analyzeFraud(formData);
+        // Edits and resubmits reuse the session so unchanged nodes are not re-run;
+        // a double-clicked first submit sends the same create key and joins one run
+        analysisCreateKey = analysisCreateKey || crypto.randomUUID();
+        const result = await API.analyzeInSession(formData, analysisSessionId, analysisCreateKey);
+        analysisSessionId = result.session_id;
+        analysisCreateKey = null;
         analysisResult = result;
 
         // Display results